@@ -1,71 +1,308 @@
 import random
+import numpy as np
 from algorithm.AlgorithmUtils import AlgorithmUtils
+from algorithm.FitnessCache import FitnessCache
+from algorithm.ParetoFront import ParetoFront
+from algorithm.SearchControl import SearchControl
+from algorithm.SolverProfile import SolverProfile
 
 class ACOAlgorithm:
-    def __init__(self, graph_obj, w1, w2, w3):
+    # Pareto modunda varsayılan koloniler: her amaç için bir köşe + dengeli vektör
+    PARETO_COLONIES = ((1.0, 0.0, 0.0), (0.0, 1.0, 0.0), (0.0, 0.0, 1.0), (1/3, 1/3, 1/3))
+
+    def __init__(self, graph_obj, w1, w2, w3, warm_start=None, profile=None):
         self.graph = graph_obj
         self.w1 = w1
         self.w2 = w2
         self.w3 = w3
-        self.pheromone = {}
-        # Feromonları Link nesneleri üzerinden değil ID tuple üzerinden tutuyoruz
-        for link in self.graph.links:
-            edge = tuple(sorted((link.source.id, link.target.id)))
-            self.pheromone[edge] = 1.0
-
-    def solve(self, S, D, ant_count=25, iterations=25):
-        G = self.graph.nx_graph
-        
+        # Karıncaların tekrar bulduğu yollar yeniden puanlanmasın
+        self.fitness_cache = FitnessCache()
+        # Son çözümün özeti (durma nedeni, ulaşılan iterasyon, değerlendirme sayısı)
+        self.run_info = None
+        # Son çözümün en iyi yolu (iter_solve tüketildikten sonra da okunur)
+        self.best_path = None
+        # İsteğe bağlı WarmStartStore: aynı/yakın talebin son feromonuyla başla
+        self.warm_start = warm_start
+        # İsteğe bağlı SolverProfile: faz süreleri ve sayaçlar run_info['profile']'a yazılır
+        self.profile = profile or SolverProfile.OFF
+        self._init_pheromone()
+
+    def _init_pheromone(self):
+        # Feromon ve sezgisel (eta^2) değerleri derlenmiş grafın kenar numaralarıyla hizalı diziler
+        cg = self.graph.compile()
+        self.pheromone = np.ones(cg.num_edges)
+        eta = np.where(cg.edge_delay > 0, 1 / np.where(cg.edge_delay > 0, cg.edge_delay, 1), 10)
+        self.eta2 = eta ** 2
+        self.graph_version = self.graph.version
+
+    def solve(self, S, D, ant_count=25, iterations=25, min_bandwidth=0,
+              patience=None, time_budget=None, max_evaluations=None, lockstep=False, control=None):
+        """
+        patience: bu kadar iterasyon iyileşme olmazsa dur
+        time_budget: saniye cinsinden süre sınırı
+        max_evaluations: fitness değerlendirme bütçesi
+        lockstep: bir iterasyondaki tüm karıncalar birlikte, vektörel olarak ilerler
+        control: dışarıdan verilen SearchControl (ilerleme takibi / iptal için);
+                 verilirse yukarıdaki üç sınır onun üzerinden okunur
+        """
+        for _ in self.iter_solve(S, D, ant_count, iterations, min_bandwidth,
+                                 patience, time_budget, max_evaluations, lockstep, control):
+            pass
+        return self.best_path
+
+    def iter_solve(self, S, D, ant_count=25, iterations=25, min_bandwidth=0,
+                   patience=None, time_budget=None, max_evaluations=None, lockstep=False, control=None):
+        """
+        solve() ile aynı arama; her iterasyon sonunda SearchControl.progress()
+        sözlüğünü (iteration, best_cost, best_path, evaluations, elapsed_ms) üretir.
+        Üreteç erken kapatılırsa arama "stopped" nedeniyle biter.
+        Sonuç self.best_path ve self.run_info'ya yazılır.
+        """
+        self.best_path = None
+        control = control or SearchControl(patience, time_budget, max_evaluations)
+        control.start()
+        profile = self.profile
+        profile.reset()
+        # Talebi taşıyamayan linkler karıncalara hiç önerilmez
+        cg = self.graph.compile(min_bandwidth)
+        s_idx, d_idx = cg.index_of(S), cg.index_of(D)
+        if s_idx < 0 or d_idx < 0:
+            control.finish()
+            self.run_info = profile.attach(control.report())
+            return
+        if self.graph_version != self.graph.version:
+            self._init_pheromone()
+        if self.warm_start is not None:
+            stored = self.warm_start.load_pheromone(self.graph.version, S, D)
+            if stored is not None and len(stored) == len(self.pheromone):
+                self.pheromone[:] = stored
+        base = self.graph.compile()
+        pheromone, eta2 = self.pheromone, self.eta2
+
+        self.fitness_cache.bind(self.graph.version)
+
         def fitness(path):
-            d, r, b = AlgorithmUtils.calculate_metrics(self.graph, path)
-            return self.w1*d + self.w2*r + self.w3*b
-
-        def choose_next_node(current, visited):
-            neighbors = [n for n in G.neighbors(current) if n not in visited]
-            if not neighbors: return None
-            weights = []
-            for n in neighbors:
-                edge = tuple(sorted((current, n)))
-                tau = self.pheromone.get(edge, 1.0)
-                d_val = G.edges[current, n]["delay"]
-                eta = 1 / d_val if d_val > 0 else 10
-                weights.append(tau * (eta ** 2))
-            
-            total = sum(weights)
-            if total == 0: return random.choice(neighbors)
-            return random.choices(neighbors, weights=[w/total for w in weights])[0]
+            c = self.fitness_cache.get(path)
+            if c is None:
+                d, r, b = AlgorithmUtils.calculate_metrics(self.graph, path)
+                c = self.w1*d + self.w2*r + self.w3*b
+                self.fitness_cache.put(path, c)
+                control.add_evaluations(1)  # önbellekten gelenler bütçeyi harcamaz
+                profile.count("fitness_evaluations")
+            else:
+                profile.count("fitness_cache_hits")
+            return c
 
         best_path = None
         best_cost = float("inf")
 
-        for _ in range(iterations):
-            paths = []
-            for _ in range(ant_count):
-                curr, visited, path = S, {S}, [S]
-                while curr != D:
-                    nxt = choose_next_node(curr, visited)
-                    if nxt is None: break
-                    path.append(nxt)
-                    visited.add(nxt)
-                    curr = nxt
-                if path[-1] == D:
-                    fixed = AlgorithmUtils.fix_path(self.graph, path)
+        try:
+            for it in range(iterations):
+                paths = []
+                # Feromon yürüyüş boyunca değişmez; seçim ağırlıkları iterasyon başında bir kez çarpılır
+                with profile.phase("ant_walk"):
+                    walks = self._walk(cg, s_idx, d_idx, ant_count, pheromone * eta2, control, lockstep)
+                if control.stop_reason is None:  # süre dolduysa yürümeyen karıncalar sayılmaz
+                    profile.count("failed_paths", ant_count - len(walks))
+                for walk in walks:
+                    # Onarım da süreye dahil: süre dolunca elde en az bir yol varsa kalanlar atlanır
+                    if paths and control.expired(): break
+                    fixed = AlgorithmUtils.fix_path(self.graph, cg.to_ids(walk), min_bandwidth, profile)
                     if fixed: paths.append(fixed)
-            
+
+                # Fitness feromona bağlı değil; önce puanlanır, sonra feromon güncellenir
+                with profile.phase("fitness"):
+                    costs = [fitness(p) for p in paths]
+
+                with profile.phase("pheromone_update"):
+                    # Buharlaşma
+                    pheromone *= 0.8
+
+                    # Güncelleme
+                    for p, c in zip(paths, costs):
+                        self._deposit(base, pheromone, p, 1 / (c + 0.0001))
+
+                        if c < best_cost:
+                            best_cost = c
+                            best_path = p
+
+                stop = control.update(it, best_cost, best_path)
+                yield control.progress()
+                if stop: break
+        except GeneratorExit:
+            control.stop_reason = control.stop_reason or "stopped"
+            raise
+        finally:
+            self.best_path = best_path
+            if self.warm_start is not None:
+                self.warm_start.save_pheromone(self.graph.version, S, D, pheromone)
+
+            control.finish()
+            self.run_info = profile.attach(control.report())
+
+    def solve_pareto(self, S, D, ant_count=25, iterations=25, min_bandwidth=0, colonies=None,
+                     patience=None, time_budget=None, max_evaluations=None, lockstep=False, control=None):
+        """
+        Çok kolonili Pareto modu: her koloni kendi (w1, w2, w3) vektörüyle
+        hem sezgisini hem feromonunu ayrı tutar; bütün kolonilerin bulduğu yollar
+        ortak bir ParetoFront'ta toplanır ve o döner. Ağırlık vektörü sonradan
+        front.select(w1, w2, w3) ile seçilir.
+        colonies: ağırlık vektörleri listesi (varsayılan PARETO_COLONIES)
+        """
+        control = control or SearchControl(patience, time_budget, max_evaluations)
+        control.start()
+        profile = self.profile
+        profile.reset()
+        front = ParetoFront()
+        cg = self.graph.compile(min_bandwidth)
+        s_idx, d_idx = cg.index_of(S), cg.index_of(D)
+        if s_idx < 0 or d_idx < 0:
+            control.finish()
+            self.run_info = profile.attach(dict(control.report(), front_size=0))
+            return front
+        base = self.graph.compile()
+
+        # Koloni x kenar: sezgi, kenarın koloni ağırlıklarıyla maliyetinin tersi
+        weights = np.asarray(colonies or self.PARETO_COLONIES, dtype=np.float64)
+        edge_cost = weights @ np.vstack((base.edge_delay, base.edge_rel_cost, base.edge_bw_cost))
+        eta2 = (1 / np.maximum(edge_cost, 1e-9)) ** 2
+        pheromone = np.ones_like(eta2)
+
+        for it in range(iterations):
+            paths, owner = [], []
+            for k in range(len(weights)):
+                with profile.phase("ant_walk"):
+                    walks = self._walk(cg, s_idx, d_idx, ant_count, pheromone[k] * eta2[k], control, lockstep)
+                if control.stop_reason is None:  # süre dolduysa yürümeyen karıncalar sayılmaz
+                    profile.count("failed_paths", ant_count - len(walks))
+                for walk in walks:
+                    if paths and control.expired(): break
+                    fixed = AlgorithmUtils.fix_path(self.graph, cg.to_ids(walk), min_bandwidth, profile)
+                    if fixed:
+                        paths.append(fixed)
+                        owner.append(k)
+
             # Buharlaşma
-            for key in self.pheromone:
-                self.pheromone[key] *= 0.8
-            
-            # Güncelleme
-            for p in paths:
-                c = fitness(p)
-                for i in range(len(p)-1):
-                    edge = tuple(sorted((p[i], p[i+1])))
-                    if edge in self.pheromone:
-                        self.pheromone[edge] += 1 / (c + 0.0001)
-                
-                if c < best_cost:
-                    best_cost = c
-                    best_path = p
-                    
-        return best_path
\ No newline at end of file
+            pheromone *= 0.8
+
+            if paths:
+                control.add_evaluations(len(paths))
+                profile.count("fitness_evaluations", len(paths))
+                with profile.phase("fitness"):
+                    d, r_cost, b_cost = AlgorithmUtils.calculate_metrics_batch(self.graph, paths)
+                objectives = np.column_stack((d, r_cost, b_cost))
+                # Her karınca kendi kolonisinin feromonuna, o koloninin maliyetiyle bırakır
+                costs = objectives @ weights.T
+                for p, k, c in zip(paths, owner, costs[np.arange(len(paths)), owner].tolist()):
+                    self._deposit(base, pheromone[k], p, 1 / (c + 0.0001))
+                front = front.merge(paths, objectives)
+
+            # Elitizm: her koloni cephedeki kendi en iyisini ayrıca pekiştirir
+            if len(front):
+                for k, w in enumerate(weights):
+                    c = front.costs(*w)
+                    best = int(np.argmin(c))
+                    self._deposit(base, pheromone[k], front.paths[best], 1 / (c[best] + 0.0001))
+
+            best_cost = front.costs(self.w1, self.w2, self.w3).min() if len(front) else float("inf")
+            if control.update(it, best_cost): break
+
+        control.finish()
+        self.run_info = profile.attach(dict(control.report(), front_size=len(front)))
+        return front
+
+    @staticmethod
+    def _deposit(base, pheromone, path, amount):
+        idx = base.to_index(path)
+        eids = base.edge_ids(idx[:-1], idx[1:])
+        np.add.at(pheromone, eids[eids >= 0], amount)
+
+    def _walk(self, cg, s_idx, d_idx, ant_count, weight, control, lockstep=False):
+        """
+        Bir iterasyonun karıncalarını yürütür; hedefe varan yürüyüşleri
+        (cg indeksleriyle) döner. weight: kenar başına feromon * eta^2.
+        """
+        if lockstep:
+            return self._walk_colony(cg, s_idx, d_idx, ant_count, weight, control)
+        return self._walk_ants(cg, s_idx, d_idx, ant_count, weight, control)
+
+    @staticmethod
+    def _choose_next_node(cg, weight, current, visited):
+        a, b = cg.offsets[current], cg.offsets[current + 1]
+        nbrs = cg.neighbors[a:b]
+        eids = cg.half_edge_id[a:b]
+        open_mask = ~visited[nbrs]
+        if not open_mask.any(): return None
+
+        # Ziyaret edilmiş komşuların ağırlığı sıfır, seçim kümülatif toplam üzerinden
+        cum = np.cumsum(weight[eids] * open_mask)
+        total = cum[-1]
+        if total <= 0: return int(random.choice(nbrs[open_mask]))
+        return int(nbrs[np.searchsorted(cum, random.random() * total, side="right")])
+
+    def _walk_ants(self, cg, s_idx, d_idx, ant_count, weight, control):
+        # Karıncalar sırayla, her biri kendi visited kümesiyle yürür
+        walks = []
+        for _ in range(ant_count):
+            if control.expired(): break
+            visited = np.zeros(cg.num_nodes, dtype=bool)
+            visited[s_idx] = True
+            curr, path = s_idx, [s_idx]
+            while curr != d_idx:
+                nxt = self._choose_next_node(cg, weight, curr, visited)
+                if nxt is None: break
+                path.append(nxt)
+                visited[nxt] = True
+                curr = nxt
+            if path[-1] == d_idx:
+                walks.append(path)
+        return walks
+
+    @staticmethod
+    def _walk_colony(cg, s_idx, d_idx, ant_count, weight, control):
+        # Tüm koloni aynı anda: (karınca x düğüm) visited maskesi ve
+        # karınca başına mevcut düğüm vektörü; hedefe varan/sıkışan karıncalar maskelenir.
+        # Süre/iptal her adımda kontrol edilir; o ana kadar varanlar döner
+        pad_nbrs, pad_eids, pad_valid = cg.padded_adjacency()
+        pad_weight = weight[pad_eids]
+        visited = np.zeros((ant_count, cg.num_nodes), dtype=bool)
+        visited[:, s_idx] = True
+        trail = np.full((ant_count, cg.num_nodes), -1, dtype=np.int64)
+        trail[:, 0] = s_idx
+        length = np.ones(ant_count, dtype=np.int64)
+        current = np.full(ant_count, s_idx, dtype=np.int64)
+        active = np.ones(ant_count, dtype=bool)
+        arrived = np.zeros(ant_count, dtype=bool)
+
+        while active.any():
+            if control.expired(): break
+            ants = np.flatnonzero(active)
+            cur = current[ants]
+            nbrs = pad_nbrs[cur]
+            open_mask = pad_valid[cur] & ~visited[ants[:, None], nbrs]
+
+            # Sıkışan karıncalar (açık komşu yok) bu iterasyonda elenir
+            stuck = ~open_mask.any(axis=1)
+            active[ants[stuck]] = False
+            ants, nbrs, open_mask = ants[~stuck], nbrs[~stuck], open_mask[~stuck]
+            if len(ants) == 0: break
+
+            weights = pad_weight[current[ants]] * open_mask
+            zero = weights.sum(axis=1) <= 0
+            weights[zero] = open_mask[zero]  # feromon sıfırsa açık komşular arasında eşit seçim
+            cum = np.cumsum(weights, axis=1)
+            r = np.random.random(len(ants)) * cum[:, -1]
+            choice = (cum <= r[:, None]).sum(axis=1)
+            nxt = nbrs[np.arange(len(ants)), choice]
+
+            current[ants] = nxt
+            visited[ants, nxt] = True
+            trail[ants, length[ants]] = nxt
+            length[ants] += 1
+
+            done = nxt == d_idx
+            arrived[ants[done]] = True
+            active[ants[done]] = False
+
+        return [trail[a, :length[a]].tolist() for a in np.flatnonzero(arrived)]
+
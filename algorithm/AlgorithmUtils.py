@@ -1,63 +1,90 @@
-import networkx as nx
-import math
 import random
+import numpy as np
+from algorithm.SolverProfile import SolverProfile
 
 class AlgorithmUtils:
 
     @staticmethod
-    def fix_path(graph_obj, node_id_list):
+    def fix_path(graph_obj, node_id_list, min_bandwidth=0, profile=None):
         """
         EKSİK OLAN PARÇA BU:
         Genetik algoritma yolları böldüğünde arada boşluk kalırsa,
         bu fonksiyon iki nokta arasını 'en kısa yol' ile doldurur.
+        min_bandwidth altındaki linkler hiç kullanılmaz.
+        profile verilirse (SolverProfile) süre ve sorgu sayıları ona yazılır.
         """
-        G = graph_obj.nx_graph
-        final_path = []
-        for i in range(len(node_id_list) - 1):
-            u, v = node_id_list[i], node_id_list[i + 1]
-            try:
+        profile = profile or SolverProfile.OFF
+        with profile.phase("fix_path"):
+            cg = graph_obj.compile(min_bandwidth)
+            sp = cg.shortest_paths()
+            runs = sp.dijkstra_runs
+            idx = cg.to_index(node_id_list).tolist()
+            final_path = []
+            queries = 0
+            for i in range(len(idx) - 1):
+                u, v = idx[i], idx[i + 1]
                 # Bağlantı yoksa veya kopuksa
-                if not nx.has_path(G, u, v):
-                    return None
+                if u < 0 or v < 0 or not sp.connected(u, v):
+                    final_path = None
+                    break
                 # Aradaki boşluğu doldur
-                p = nx.shortest_path(G, u, v, weight="delay")
-            except nx.NetworkXNoPath:
+                p = sp.path(u, v, weight="delay")
+                queries += 1
+
+                if i == 0:
+                    final_path.extend(p)
+                else:
+                    # Önceki parçanın sonu ile yenisinin başı aynı olmasın diye
+                    final_path.extend(p[1:])
+            profile.count("shortest_path_queries", queries)
+            profile.count("dijkstra_runs", sp.dijkstra_runs - runs)
+            if final_path is None:
+                profile.count("failed_paths")
                 return None
-            
-            if i == 0:
-                final_path.extend(p)
-            else:
-                # Önceki parçanın sonu ile yenisinin başı aynı olmasın diye
-                final_path.extend(p[1:])
-        return final_path
+            return cg.to_ids(final_path)
 
     @staticmethod
-    def create_a_path(graph_obj, src, dst):
+    def create_a_path(graph_obj, src, dst, min_bandwidth=0, profile=None):
         """
         Genetik Algoritma için başlangıç popülasyonu üretir.
         Körlemesine değil, akıllı rastgelelik kullanır.
+        min_bandwidth altındaki linkler hiç kullanılmaz.
+        profile verilirse (SolverProfile) süre ve sorgu sayıları ona yazılır.
         """
-        G = graph_obj.nx_graph
-        try:
-            # %70 İhtimalle çeşitlilik kat (Ara durak seç)
-            if random.random() < 0.7:
-                nodes = list(G.nodes())
-                # 10 kere dene, uygun bir ara düğüm bul
-                for _ in range(10):
-                    mid_node = random.choice(nodes)
-                    if mid_node != src and mid_node != dst:
-                        if nx.has_path(G, src, mid_node) and nx.has_path(G, mid_node, dst):
-                            p1 = nx.shortest_path(G, src, mid_node, weight="delay")
-                            p2 = nx.shortest_path(G, mid_node, dst, weight="delay")
-                            return p1[:-1] + p2 
+        profile = profile or SolverProfile.OFF
+        with profile.phase("create_a_path"):
+            cg = graph_obj.compile(min_bandwidth)
+            sp = cg.shortest_paths()
+            runs = sp.dijkstra_runs
+            path = AlgorithmUtils._random_path(cg, sp, cg.index_of(src), cg.index_of(dst))
+            profile.count("shortest_path_queries", 0 if path is None else path[0])
+            profile.count("dijkstra_runs", sp.dijkstra_runs - runs)
+            if path is None:
+                profile.count("failed_paths")
+                return None
+            return cg.to_ids(path[1])
 
-            # %30 İhtimalle veya başarısız olursa direkt en kısayı ver
-            if nx.has_path(G, src, dst):
-                weight_type = "bandwidth" if random.random() < 0.3 else "delay"
-                return nx.shortest_path(G, src, dst, weight=weight_type)
-                
-        except Exception:
+    @staticmethod
+    def _random_path(cg, sp, s, d):
+        # (en kısa yol sorgu sayısı, indeks yolu) ya da None
+        if s < 0 or d < 0:
             return None
+
+        # %70 İhtimalle çeşitlilik kat (Ara durak seç)
+        if random.random() < 0.7:
+            # 10 kere dene, uygun bir ara düğüm bul
+            for _ in range(10):
+                mid_node = random.randrange(cg.num_nodes)
+                if mid_node != s and mid_node != d:
+                    if sp.connected(s, mid_node) and sp.connected(mid_node, d):
+                        p1 = sp.path(s, mid_node, weight="delay")
+                        p2 = sp.path(mid_node, d, weight="delay")
+                        return 2, p1[:-1] + p2
+
+        # %30 İhtimalle veya başarısız olursa direkt en kısayı ver
+        if sp.connected(s, d):
+            weight_type = "bandwidth" if random.random() < 0.3 else "delay"
+            return 1, sp.path(s, d, weight=weight_type)
         return None
 
     @staticmethod
@@ -67,51 +94,25 @@ class AlgorithmUtils:
         """
         if not path_ids: return float('inf'), float('inf'), float('inf')
 
-        G = graph_obj.nx_graph
-        total_delay = 0
-        reliability_cost = 0.0 
-        bandwidth_cost = 0.0
-
-        # 1. Kenarlar (Links)
-        for i in range(len(path_ids) - 1):
-            u, v = path_ids[i], path_ids[i + 1]
-            
-            if G.has_edge(u, v):
-                data = G.edges[u, v]
-                delay = data.get("delay", 0)
-                bw = data.get("bandwidth", 100)
-                rel = data.get("reliability", 0.99)
-            else:
-                 continue
-
-            total_delay += delay
-            reliability_cost += -math.log(rel + 1e-12)
-            bandwidth_cost += (1000.0 / (bw + 1e-9))
-
-        # 2. Ara Düğümler (S ve D hariç işlem süresi)
-        if len(path_ids) > 2:
-            intermediate_nodes = path_ids[1:-1]
-            for node_id in intermediate_nodes:
-                node = graph_obj.get_node(node_id)
-                if node:
-                    total_delay += getattr(node, 's_ms', 0)
-                    reliability_cost += -math.log(getattr(node, 'reliability', 0.99) + 1e-12)
-        
-        # Uç Düğümlerin Güvenilirliği
-        start_node = graph_obj.get_node(path_ids[0])
-        end_node = graph_obj.get_node(path_ids[-1])
-        if start_node: reliability_cost += -math.log(getattr(start_node, 'reliability', 0.99) + 1e-12)
-        if end_node: reliability_cost += -math.log(getattr(end_node, 'reliability', 0.99) + 1e-12)
+        delay, rel_cost, bw_cost = AlgorithmUtils.calculate_metrics_batch(graph_obj, [path_ids])
+        return float(delay[0]), float(rel_cost[0]), float(bw_cost[0])
 
-        return total_delay, reliability_cost, bandwidth_cost
+    @staticmethod
+    def calculate_metrics_batch(graph_obj, paths):
+        """
+        Bütün bir popülasyonun metriklerini tek NumPy geçişinde hesaplar.
+        (gecikme, güvenilirlik maliyeti, bant genişliği maliyeti) vektörleri döner.
+        """
+        cg = graph_obj.compile()
+        offsets, indices = cg.pack_paths(paths)
+        return cg.path_metrics(offsets, indices)
 
     @staticmethod
     def get_bandwidth(graph_obj, path_ids):
         if not path_ids: return "0"
-        path_bw = []    
-        for i in range(len(path_ids) - 1):
-             bw = AlgorithmUtils.get_link_a_to_b(graph_obj, path_ids[i], path_ids[i + 1])
-             path_bw.append(f"{bw:.1f}")
+        # Tüm adımların bant genişliği tek çağrıda (link yoksa 1.0)
+        bws = graph_obj.path_attributes(path_ids)['bandwidth']
+        path_bw = [f"{bw:.1f}" for bw in np.nan_to_num(bws, nan=1.0).tolist()]
         return f"Path BWs: {path_bw}"
 
     @staticmethod
@@ -131,8 +132,7 @@ class AlgorithmUtils:
 
     @staticmethod
     def get_link_a_to_b(graph_obj, a_node, b_node): 
-        for link in graph_obj.links: 
-            if ((link.source.id == a_node and link.target.id == b_node) or 
-                (link.source.id == b_node and link.target.id == a_node)): 
-                return link.bandwidth
+        link = graph_obj.get_link(a_node, b_node)
+        if link is not None:
+            return link.bandwidth
         return 1.0
\ No newline at end of file
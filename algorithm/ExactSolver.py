@@ -0,0 +1,97 @@
+import heapq
+from algorithm.SearchControl import SearchControl
+from algorithm.SolverProfile import SolverProfile
+
+
+class ExactSolver:
+    """
+    Ağırlıklı toplam amacın kesin (optimal) çözümü.
+
+    w1*gecikme + w2*güvenilirlik maliyeti + w3*bant genişliği maliyeti her adıma
+    toplanabilir: kenar terimleri (gecikme, -log güvenilirlik, 1000/BW) ve
+    girilen düğümün terimleri (işlem süresi, -log güvenilirlik). Ağırlıklar
+    negatif olmadığından bu bileşik kenar ağırlığı üzerinde Dijkstra en iyi
+    yolu verir. min_bandwidth altındaki linkler grafa hiç alınmaz.
+    GA/ACO ile aynı arayüze sahiptir; sapma (gap) ve hızlanma ölçümünde referanstır.
+    """
+
+    def __init__(self, graph_obj, w1, w2, w3, warm_start=None, profile=None):
+        if min(w1, w2, w3) < 0:
+            raise ValueError("Kesin çözüm negatif olmayan ağırlıklar gerektirir.")
+        self.graph = graph_obj
+        self.w1 = w1  # Delay
+        self.w2 = w2  # Reliability
+        self.w3 = w3  # Bandwidth
+        # Son çözümün özeti (GA/ACO ile aynı alanlar)
+        self.run_info = None
+        # Arayüz uyumu için; kesin çözüm sıcak başlangıç kullanmaz
+        self.warm_start = warm_start
+        # İsteğe bağlı SolverProfile: faz süreleri ve sayaçlar run_info['profile']'a yazılır
+        self.profile = profile or SolverProfile.OFF
+
+    def edge_weights(self, cg):
+        """
+        CSR sırasındaki her yarım kenarın (u -> v) bileşik ağırlığı:
+        kenar terimleri + v'nin ara düğüm terimleri.
+        """
+        base = cg.base
+        edge_cost = (self.w1 * base.edge_delay + self.w2 * base.edge_rel_cost
+                     + self.w3 * base.edge_bw_cost)
+        node_cost = self.w1 * base.node_s_ms + self.w2 * base.node_rel_cost
+        return edge_cost[cg.half_edge_id] + node_cost[cg.neighbors]
+
+    def solve(self, S, D, min_bandwidth=0, control=None, **_):
+        """
+        S -> D için en düşük maliyetli yol (id listesi), yoksa None.
+        GA/ACO'ya özgü parametreler (pop_size, iterations, ...) yok sayılır.
+        """
+        control = control or SearchControl()
+        control.start()
+        self.profile.reset()
+        cg = self.graph.compile(min_bandwidth)
+        s, d = cg.index_of(S), cg.index_of(D)
+        path = None
+        if s >= 0 and d >= 0 and cg.shortest_paths().connected(s, d):
+            with self.profile.phase("dijkstra"):
+                path = cg.to_ids(self._dijkstra(cg, s, d))
+            self.profile.count("dijkstra_runs")
+            base = cg.base
+            # Hedef ara düğüm olmadığı için işlem süresi geri alınır, kaynak düğümün güvenilirliği eklenir
+            cost = self._cost + self.w2 * base.node_rel_cost[s] - self.w1 * base.node_s_ms[d]
+            if s == d:
+                cost = 2 * self.w2 * base.node_rel_cost[s]
+            control.add_evaluations(1)
+            control.update(0, cost)
+        control.finish()
+        self.run_info = self.profile.attach(control.report())
+        return path
+
+    def _dijkstra(self, cg, src, dst):
+        # NumPy skalerleri döngüde yavaş, diziler bir kez listeye çevrilir
+        weights = self.edge_weights(cg).tolist()
+        neighbors = cg.neighbors.tolist()
+        offsets = cg.offsets.tolist()
+        n = cg.num_nodes
+        best = [float("inf")] * n
+        pred = [-1] * n
+        done = [False] * n
+        best[src] = 0.0
+        heap = [(0.0, src)]
+        while heap:
+            dist, u = heapq.heappop(heap)
+            if done[u]: continue
+            done[u] = True
+            if u == dst: break
+            for i in range(offsets[u], offsets[u + 1]):
+                v = neighbors[i]
+                nd = dist + weights[i]
+                if nd < best[v]:
+                    best[v] = nd
+                    pred[v] = u
+                    heapq.heappush(heap, (nd, v))
+        self._cost = best[dst]
+
+        path = [dst]
+        while path[-1] != src:
+            path.append(pred[path[-1]])
+        return path[::-1]
@@ -0,0 +1,62 @@
+from collections import OrderedDict
+
+
+class FitnessCache:
+    """
+    Yol -> fitness değeri için sınırlı boyutlu LRU önbellek.
+
+    Her çözücü kendi önbelleğini tutar (graf ve ağırlıklar çözücüye sabittir).
+    Graf değişirse bind() ile verilen sürüm değişir ve önbellek boşaltılır.
+    """
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    @staticmethod
+    def key(path):
+        # Yolun kendisi (tuple) anahtar; sözlük hash'i bir kez hesaplar
+        return tuple(path)
+
+    def bind(self, version):
+        if version != self.version:
+            self.clear()
+            self.version = version
+
+    def get(self, path):
+        k = self.key(path)
+        if k in self._data:
+            self._data.move_to_end(k)
+            self.hits += 1
+            return self._data[k]
+        self.misses += 1
+        return None
+
+    def put(self, path, value):
+        k = self.key(path)
+        self._data[k] = value
+        self._data.move_to_end(k)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hit_rate,
+            'size': len(self._data),
+        }
@@ -1,25 +1,116 @@
 import random
 import numpy as np
 from algorithm.AlgorithmUtils import AlgorithmUtils
+from algorithm.FitnessCache import FitnessCache
+from algorithm.ParetoFront import ParetoFront
+from algorithm.SearchControl import SearchControl
+from algorithm.SolverProfile import SolverProfile
 
 
 class GeneticAlgorithm:
-    def __init__(self, graph_obj, w1, w2, w3):
+    def __init__(self, graph_obj, w1, w2, w3, warm_start=None, profile=None):
         self.graph = graph_obj
         self.w1 = w1  # Delay
         self.w2 = w2  # Reliability
         self.w3 = w3  # Bandwidth
+        # Elitler ve ebeveyninin aynısı çocuklar tekrar puanlanmasın
+        self.fitness_cache = FitnessCache()
+        # Talep edilen bant genişliği (altındaki linkler aramaya girmez)
+        self.min_bandwidth = 0
+        # Son çözümün özeti (durma nedeni, ulaşılan nesil, değerlendirme sayısı)
+        self.run_info = None
+        # Son çözümün en iyi yolu (iter_solve tüketildikten sonra da okunur)
+        self.best_path = None
+        # İsteğe bağlı WarmStartStore: aynı/yakın talep için elit yollarla başla
+        self.warm_start = warm_start
+        # İsteğe bağlı SolverProfile: faz süreleri ve sayaçlar run_info['profile']'a yazılır
+        self.profile = profile or SolverProfile.OFF
 
 
     def fitness_function(self, path):
 
         if not path: return float('inf')
+        self.fitness_cache.bind(self.graph.version)
+        cached = self.fitness_cache.get(path)
+        if cached is not None: return cached
+
         # AlgorithmUtils.calculate_metrics hata fırlatmaması için yolun geçerliliğini kontrol eder
         d, r_cost, b_cost = AlgorithmUtils.calculate_metrics(self.graph, path)
 
         # Eğer yolda kopukluk varsa (calculate_metrics içindeki kontrolden döner)
         # yüksek maliyet vererek elenmesini sağlarız
-        return (self.w1 * d) + (self.w2 * r_cost) + (self.w3 * b_cost)
+        score = (self.w1 * d) + (self.w2 * r_cost) + (self.w3 * b_cost)
+        self.fitness_cache.put(path, score)
+        return score
+
+    def fitness_batch(self, population, control=None):
+        """
+        Popülasyonun tüm fitness değerlerini tek seferde hesaplar.
+        Önbellekte olanlar atlanır, kalanlar tek NumPy geçişinde puanlanır.
+        control verilirse yalnızca gerçekten hesaplananlar bütçeye yazılır.
+        """
+        self.fitness_cache.bind(self.graph.version)
+        scores = np.empty(len(population))
+        missing = []
+        for i, p in enumerate(population):
+            cached = self.fitness_cache.get(p) if p else float('inf')
+            if cached is None:
+                missing.append(i)
+            else:
+                scores[i] = cached
+
+        if missing:
+            d, r_cost, b_cost = AlgorithmUtils.calculate_metrics_batch(
+                self.graph, [population[i] for i in missing])
+            fresh = (self.w1 * d) + (self.w2 * r_cost) + (self.w3 * b_cost)
+            for i, score in zip(missing, fresh.tolist()):
+                scores[i] = score
+                self.fitness_cache.put(population[i], score)
+        if control is not None:
+            control.add_evaluations(len(missing))
+        self.profile.count("fitness_evaluations", len(missing))
+        self.profile.count("fitness_cache_hits", len(population) - len(missing))
+        return scores
+
+    def objectives_batch(self, population):
+        """Popülasyonun (gecikme, güvenilirlik maliyeti, bant genişliği maliyeti) matrisi (N x 3)."""
+        if not population: return np.zeros((0, 3))
+        self.profile.count("fitness_evaluations", len(population))
+        d, r_cost, b_cost = AlgorithmUtils.calculate_metrics_batch(self.graph, population)
+        return np.column_stack((d, r_cost, b_cost))
+
+    def initial_population(self, S, D, pop_size, control=None):
+        # Önce sıcak başlangıç deposundaki elitler (onarılarak), kalan yer rastgele yollarla.
+        # control verilirse her yoldan sonra bakılır: süre/bütçe dolunca en az bir yolla,
+        # iptalde hemen döner (küçük bütçeler kurulum aşamasında aşılmasın)
+        def expired():
+            return control is not None and control.expired() and (population or control.cancelled)
+
+        population = []
+        if self.warm_start is not None:
+            for seed in self.warm_start.load_population(self.graph.version, S, D):
+                p = AlgorithmUtils.fix_path(self.graph, seed, self.min_bandwidth, self.profile)
+                if p and p not in population:
+                    population.append(p)
+                if expired(): return population
+        for _ in range(pop_size - len(population)): 
+            p = AlgorithmUtils.create_a_path(self.graph, S, D, self.min_bandwidth, self.profile)
+            if p and p not in population:
+                population.append(p)
+            if len(population) >= pop_size or expired(): break
+        return population
+
+    def breed(self, parent, S, D):
+        # Crossover & Mutation
+        if random.random() < 0.8:
+            with self.profile.phase("crossover"):
+                child = self.crossover(parent, S, D)
+        else:
+            child = parent.copy()
+        if random.random() < 0.3:
+            with self.profile.phase("mutate"):
+                child = self.mutate(child)
+        return child
 
     def crossover(self, parent, S, D):
         
@@ -30,13 +121,13 @@ class GeneticAlgorithm:
 
         if random.random() < 0.5:
             # Başı sabit tut, mid_node'dan hedefe yeni yol bul
-            new_tail = AlgorithmUtils.create_a_path(self.graph,mid_node, D)
+            new_tail = AlgorithmUtils.create_a_path(self.graph, mid_node, D, self.min_bandwidth, self.profile)
             if new_tail:
                 # parent[:mid_idx] (0'dan mid-1'e kadar) + new_tail (mid'den D'ye kadar)
                 return parent[:mid_idx] + new_tail
         else:
             # Sonu sabit tut, kaynaktan mid_node'a yeni yol bul
-            new_head = AlgorithmUtils.create_a_path(self.graph,S, mid_node)
+            new_head = AlgorithmUtils.create_a_path(self.graph, S, mid_node, self.min_bandwidth, self.profile)
             if new_head:
                 # new_head (S'den mid'e kadar) + parent[mid_idx+1:] (mid+1'den sona kadar)
                 return new_head + parent[mid_idx + 1:]
@@ -51,52 +142,155 @@ class GeneticAlgorithm:
         idx = random.randint(1, len(child) - 2)
 
         # Seçilen rastgele bir noktadan hedefe yeni bir rota çiz
-        new_segment = AlgorithmUtils.create_a_path(self.graph,child[idx], child[-1])
+        new_segment = AlgorithmUtils.create_a_path(self.graph, child[idx], child[-1], self.min_bandwidth, self.profile)
         if new_segment:
             return child[:idx] + new_segment
         return child
 
-    def solve(self, S, D, pop_size=100, generations=100):
+    def solve(self, S, D, pop_size=100, generations=100, min_bandwidth=0,
+              patience=None, time_budget=None, max_evaluations=None, control=None):
+        """
+        patience: bu kadar nesil iyileşme olmazsa dur
+        time_budget: saniye cinsinden süre sınırı
+        max_evaluations: fitness değerlendirme bütçesi
+        control: dışarıdan verilen SearchControl (ilerleme takibi / iptal için);
+                 verilirse yukarıdaki üç sınır onun üzerinden okunur
+        """
+        for _ in self.iter_solve(S, D, pop_size, generations, min_bandwidth,
+                                 patience, time_budget, max_evaluations, control):
+            pass
+        return self.best_path
+
+    def iter_solve(self, S, D, pop_size=100, generations=100, min_bandwidth=0,
+                   patience=None, time_budget=None, max_evaluations=None, control=None):
+        """
+        solve() ile aynı arama; her nesil sonunda SearchControl.progress()
+        sözlüğünü (iteration, best_cost, best_path, evaluations, elapsed_ms) üretir.
+        Üreteç erken kapatılırsa arama "stopped" nedeniyle biter.
+        Sonuç self.best_path ve self.run_info'ya yazılır.
+        """
+        self.min_bandwidth = min_bandwidth
+        self.best_path = None
+        control = control or SearchControl(patience, time_budget, max_evaluations)
+        control.start()
+        self.profile.reset()
+
         # 1. Başlangıç Popülasyonu 
-        population = []
-        for _ in range(pop_size): 
-            p = AlgorithmUtils.create_a_path(self.graph,S, D)
-            if p and p not in population:
-                population.append(p)
-            if len(population) >= pop_size: break
+        with self.profile.phase("initialization"):
+            population = self.initial_population(S, D, pop_size, control)
 
-        if not population: return None
+        if not population:
+            control.finish()
+            self.run_info = self.profile.attach(control.report())
+            return
 
         best_path = None
         best_fitness = float('inf')
 
-        for gen in range(generations):
-            # Fitness skorlarını hesapla
-            scores = [self.fitness_function(p) for p in population]
+        try:
+            for gen in range(generations):
+                # Fitness skorlarını hesapla
+                with self.profile.phase("fitness"):
+                    scores = self.fitness_batch(population, control)
+
+                # En iyiyi güncelle
+                min_idx = np.argmin(scores)
+                if scores[min_idx] < best_fitness:
+                    best_fitness = scores[min_idx]
+                    best_path = population[min_idx]
+
+                stop = control.update(gen, best_fitness, best_path)
+                yield control.progress()
+                if stop: break
+
+                # Yeni nesil (Elitizm %10)
+                new_pop = []
+                elites = np.argsort(scores)[:max(1, int(pop_size * 0.1))]
+                for e in elites:
+                    new_pop.append(population[e])
 
-            # En iyiyi güncelle
-            min_idx = np.argmin(scores)
-            if scores[min_idx] < best_fitness:
-                best_fitness = scores[min_idx]
-                best_path = population[min_idx]
+                while len(new_pop) < pop_size:
+                    # Süre/iptal her çocukta kontrol edilir; eksik nesil bir sonraki turda puanlanır
+                    if control.expired(): break
+                    # Tournament Selection
+                    # Bant genişliği filtresi tek bir yol bırakmışsa o yol kendisiyle yarışır
+                    idx1, idx2 = random.sample(range(len(population)), 2) if len(population) > 1 else (0, 0)
+                    p1 = population[idx1] if scores[idx1] < scores[idx2] else population[idx2]
 
-            # Yeni nesil (Elitizm %10)
-            new_pop = []
-            elites = np.argsort(scores)[:max(1, int(pop_size * 0.1))]
-            for e in elites:
-                new_pop.append(population[e])
+                    new_pop.append(self.breed(p1, S, D))
 
-            while len(new_pop) < pop_size:
-                # Tournament Selection
-                idx1, idx2 = random.sample(range(len(population)), 2)
-                p1 = population[idx1] if scores[idx1] < scores[idx2] else population[idx2]
+                population = new_pop
+        except GeneratorExit:
+            control.stop_reason = control.stop_reason or "stopped"
+            raise
+        finally:
+            self.best_path = best_path
+            if self.warm_start is not None:
+                elites = np.argsort(self.fitness_batch(population))[:max(1, int(pop_size * 0.1))]
+                self.warm_start.save_population(self.graph.version, S, D, [population[e] for e in elites])
 
-                # Crossover & Mutation
-                child = self.crossover(p1, S, D) if random.random() < 0.8 else p1.copy()
-                child = self.mutate(child) if random.random() < 0.3 else child
+            control.finish()
+            self.run_info = self.profile.attach(control.report())
 
-                new_pop.append(child)
+    def solve_pareto(self, S, D, pop_size=100, generations=100, min_bandwidth=0,
+                     patience=None, time_budget=None, max_evaluations=None, control=None):
+        """
+        NSGA-II modu: ağırlıklı toplam yerine üç amaç birlikte küçültülür ve
+        tek çalıştırmada Pareto cephesi (ParetoFront) döner. Ağırlık vektörü
+        sonradan front.select(w1, w2, w3) ile seçilir.
+        patience, çözücünün kendi ağırlıklarıyla cephedeki en iyi maliyete bakar.
+        """
+        self.min_bandwidth = min_bandwidth
+        control = control or SearchControl(patience, time_budget, max_evaluations)
+        control.start()
+        self.profile.reset()
+        front = ParetoFront()
+
+        with self.profile.phase("initialization"):
+            population = self.initial_population(S, D, pop_size, control)
+        if not population:
+            control.finish()
+            self.run_info = self.profile.attach(dict(control.report(), front_size=0))
+            return front
+
+        with self.profile.phase("fitness"):
+            objectives = self.objectives_batch(population)
+        control.add_evaluations(len(population))
+        _, ranks, distance = ParetoFront.select_survivors(objectives, len(population))
+
+        for gen in range(generations):
+            front = front.merge(population, objectives)
+            if control.update(gen, front.costs(self.w1, self.w2, self.w3).min()): break
+
+            # İkili turnuva: küçük cephe numarası, eşitlikte büyük kalabalık mesafesi
+            offspring = []
+            while len(offspring) < pop_size:
+                if control.expired(): break
+                idx1, idx2 = random.sample(range(len(population)), 2) if len(population) > 1 else (0, 0)
+                better = idx1 if (ranks[idx1], -distance[idx1]) < (ranks[idx2], -distance[idx2]) else idx2
+                offspring.append(self.breed(population[better], S, D))
+
+            # Ebeveyn + çocuk havuzundan (tekrarsız) en iyi pop_size birey kalır
+            pool = population + offspring
+            with self.profile.phase("fitness"):
+                pool_objectives = np.vstack((objectives, self.objectives_batch(offspring)))
+            control.add_evaluations(len(offspring))
+            seen, unique = set(), []
+            for i, p in enumerate(pool):
+                if tuple(p) not in seen:
+                    seen.add(tuple(p))
+                    unique.append(i)
+            keep, pool_ranks, pool_distance = ParetoFront.select_survivors(pool_objectives[unique], pop_size)
+            chosen = [unique[k] for k in keep]
+            population = [pool[i] for i in chosen]
+            objectives = pool_objectives[chosen]
+            ranks, distance = pool_ranks[keep], pool_distance[keep]
+        else:
+            front = front.merge(population, objectives)
 
-            population = new_pop
+        if self.warm_start is not None and len(front):
+            self.warm_start.save_population(self.graph.version, S, D, front.paths)
 
-        return best_path
\ No newline at end of file
+        control.finish()
+        self.run_info = self.profile.attach(dict(control.report(), front_size=len(front)))
+        return front
@@ -0,0 +1,117 @@
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from algorithm.SearchControl import SearchControl
+
+
+class JobManager:
+    """
+    Uzun süren çözümler için arka plan işleri.
+
+    submit() işi sınırlı bir iş parçacığı havuzuna verir ve hemen iş
+    numarası döner. Her iş kendi SearchControl'ünü taşır: her nesil/iterasyon
+    sonunda en iyi maliyet ilerleme listesine yazılır, cancel() ile iş
+    bir sonraki kontrol noktasında durur. Bekleyen iş sayısı max_pending'i
+    aşarsa yeni iş reddedilir; biten işlerden en eskileri max_jobs
+    sınırında silinir.
+    """
+
+    def __init__(self, max_workers=2, max_pending=16, max_jobs=100):
+        self.max_pending = max_pending
+        self.max_jobs = max_jobs
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="solve")
+        self._jobs = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def submit(self, task, patience=None, time_budget=None, max_evaluations=None):
+        """
+        task(control) -> sonuç sözlüğü. İş numarası döner; kuyruk doluysa
+        RuntimeError fırlatır.
+        """
+        with self._lock:
+            pending = sum(1 for job in self._jobs.values() if job['status'] in ("queued", "running"))
+            if pending >= self.max_pending:
+                raise RuntimeError("Çok fazla bekleyen iş var, daha sonra tekrar deneyin.")
+            self._trim()
+            job_id = str(next(self._ids))
+            job = {
+                'id': job_id,
+                'status': "queued",
+                'progress': [],
+                'result': None,
+                'error': None,
+                'submitted': time.time(),
+            }
+            job['control'] = SearchControl(patience, time_budget, max_evaluations,
+                                           on_progress=lambda control: self._record(job, control))
+            self._jobs[job_id] = job
+            job['future'] = self._pool.submit(self._run, job, task)
+        return job_id
+
+    def _run(self, job, task):
+        with self._lock:
+            if job['status'] == "cancelled": return
+            job['status'] = "running"
+        try:
+            result = task(job['control'])
+            with self._lock:
+                job['result'] = result
+                job['status'] = "cancelled" if job['control'].cancelled else "done"
+        except Exception as e:
+            with self._lock:
+                job['error'] = str(e)
+                job['status'] = "failed"
+
+    def _record(self, job, control):
+        # Çözücü iş parçacığından her nesil/iterasyon sonunda çağrılır
+        entry = {
+            'iteration': control.iteration,
+            'best_cost': control.best_cost if control.best_cost != float("inf") else None,
+            'evaluations': control.evaluations,
+            'elapsed_ms': control.elapsed() * 1000,
+        }
+        with self._lock:
+            job['progress'].append(entry)
+
+    def _trim(self):
+        finished = [job_id for job_id, job in self._jobs.items()
+                    if job['status'] not in ("queued", "running")]
+        for job_id in finished[:max(0, len(self._jobs) - self.max_jobs + 1)]:
+            del self._jobs[job_id]
+
+    def status(self, job_id, since=0):
+        """
+        İşin durumu ve since'ten sonraki ilerleme kayıtları; iş yoksa None.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None: return None
+            progress = job['progress']
+            return {
+                'id': job_id,
+                'status': job['status'],
+                'progress': progress[since:],
+                'next': len(progress),
+                'latest': progress[-1] if progress else None,
+                'error': job['error'],
+            }
+
+    def result(self, job_id):
+        """(durum, sonuç) döner; iş yoksa (None, None)."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None: return None, None
+            return job['status'], job['result']
+
+    def cancel(self, job_id):
+        """İşi iptal eder. Kuyruktaysa hiç başlamaz, çalışıyorsa sonraki kontrol noktasında durur."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None: return False
+            if job['status'] in ("queued", "running"):
+                job['control'].cancel()
+                if job['future'].cancel() or job['status'] == "queued":
+                    job['status'] = "cancelled"
+            return True
@@ -0,0 +1,115 @@
+import numpy as np
+
+
+class ParetoFront:
+    """
+    Baskılanmayan (non-dominated) yolların kümesi ve NSGA-II yardımcıları.
+
+    Her yolun üç amacı vardır: (gecikme, güvenilirlik maliyeti, bant genişliği maliyeti).
+    Hepsi küçültülür. Ağırlık vektörü çözümden sonra seçilir; select() cephe
+    üzerinde w1*d + w2*r + w3*b'yi en küçükleyen yolu döner (yeniden arama yok).
+    """
+
+    OBJECTIVES = ("delay", "rel_cost", "bw_cost")
+
+    def __init__(self, paths=(), objectives=None):
+        self.paths = [list(p) for p in paths]
+        self.objectives = (np.zeros((0, 3)) if objectives is None
+                           else np.asarray(objectives, dtype=np.float64).reshape(-1, 3))
+
+    # --- NSGA-II ---
+    @staticmethod
+    def non_dominated_sort(objectives):
+        """
+        Her satırın cephe numarası (0 = baskılanmayan). i, j'yi her amaçta
+        en az onun kadar iyi ve en az birinde daha iyiyse baskılar.
+        """
+        F = np.asarray(objectives, dtype=np.float64)
+        n = len(F)
+        ranks = np.full(n, -1, dtype=np.int64)
+        if n == 0: return ranks
+        le = (F[:, None, :] <= F[None, :, :]).all(axis=2)
+        lt = (F[:, None, :] < F[None, :, :]).any(axis=2)
+        dominates = le & lt  # [i, j]: i, j'yi baskılar
+        counts = dominates.sum(axis=0)
+        rank = 0
+        remaining = np.ones(n, dtype=bool)
+        while remaining.any():
+            front = remaining & (counts == 0)
+            ranks[front] = rank
+            remaining &= ~front
+            counts -= dominates[front].sum(axis=0)
+            rank += 1
+        return ranks
+
+    @staticmethod
+    def crowding_distance(objectives, ranks):
+        """Aynı cephedeki komşulara normalize uzaklık; uçlar sonsuz."""
+        F = np.asarray(objectives, dtype=np.float64)
+        distance = np.zeros(len(F))
+        for rank in np.unique(ranks):
+            members = np.flatnonzero(ranks == rank)
+            if len(members) <= 2:
+                distance[members] = np.inf
+                continue
+            for k in range(F.shape[1]):
+                order = members[np.argsort(F[members, k], kind="stable")]
+                values = F[order, k]
+                span = values[-1] - values[0]
+                distance[order[0]] = distance[order[-1]] = np.inf
+                if span > 0:
+                    distance[order[1:-1]] += (values[2:] - values[:-2]) / span
+        return distance
+
+    @staticmethod
+    def select_survivors(objectives, count):
+        """
+        NSGA-II çevresel seçimi: önce cephe numarası, eşitlikte büyük
+        kalabalık mesafesi. Seçilen indeksler ve (rank, mesafe) döner.
+        """
+        ranks = ParetoFront.non_dominated_sort(objectives)
+        distance = ParetoFront.crowding_distance(objectives, ranks)
+        order = np.lexsort((-distance, ranks))[:count]
+        return order, ranks, distance
+
+    # --- Cephe ---
+    @classmethod
+    def from_candidates(cls, paths, objectives):
+        """Adaylardan (tekrarsız, sonlu) baskılanmayan yolları seçer."""
+        F = np.asarray(objectives, dtype=np.float64).reshape(-1, 3)
+        seen, keep = set(), []
+        for i, p in enumerate(paths):
+            key = tuple(p)
+            if p and key not in seen and np.isfinite(F[i]).all():
+                seen.add(key)
+                keep.append(i)
+        if not keep:
+            return cls()
+        F = F[keep]
+        first = np.flatnonzero(cls.non_dominated_sort(F) == 0)
+        # Gecikmeye göre sıralı tutulur (grafikte/listede okunaklı olsun)
+        first = first[np.argsort(F[first, 0], kind="stable")]
+        return cls([paths[keep[i]] for i in first], F[first])
+
+    def merge(self, paths, objectives):
+        """Bu cephe ile yeni adayların birleşiminin cephesi."""
+        return ParetoFront.from_candidates(
+            self.paths + [list(p) for p in paths],
+            np.vstack((self.objectives, np.asarray(objectives, dtype=np.float64).reshape(-1, 3))))
+
+    def costs(self, w1, w2, w3):
+        return self.objectives @ np.array([w1, w2, w3], dtype=np.float64)
+
+    def select(self, w1, w2, w3):
+        """Verilen ağırlıklarla en iyi yol ve amaçları (path, (d, r, b)); cephe boşsa (None, None)."""
+        if not self.paths:
+            return None, None
+        i = int(np.argmin(self.costs(w1, w2, w3)))
+        return self.paths[i], tuple(self.objectives[i].tolist())
+
+    def to_list(self):
+        return [dict(zip(("path",) + self.OBJECTIVES, (p,) + tuple(f)))
+                for p, f in zip(self.paths, self.objectives.tolist())]
+
+    def __len__(self):
+        return len(self.paths)
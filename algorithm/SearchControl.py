@@ -0,0 +1,93 @@
+import time
+
+
+class SearchControl:
+    """
+    GA ve ACO döngüleri için durdurma kriterleri:
+    - patience: en iyi maliyet K nesil/iterasyon boyunca iyileşmezse dur
+    - time_budget: saniye cinsinden duvar saati sınırı
+    - max_evaluations: toplam fitness değerlendirme bütçesi; yalnızca gerçekten
+      hesaplanan yollar sayılır, fitness önbelleğinden gelenler sayılmaz
+    - cancel(): başka bir iş parçacığından iptal
+    Hangi kriterin tetiklendiği report() ile okunur. on_progress verilirse
+    her nesil/iterasyon sonunda bu nesneyle çağrılır; anlık durum progress() ile okunur.
+    """
+
+    def __init__(self, patience=None, time_budget=None, max_evaluations=None, on_progress=None):
+        self.patience = patience
+        self.time_budget = time_budget
+        self.max_evaluations = max_evaluations
+        self.on_progress = on_progress
+        # İptal start() ile sıfırlanmaz: çözüm başlamadan gelen iptal de geçerli
+        self.cancelled = False
+        self.start()
+
+    def start(self):
+        self.started = time.perf_counter()
+        self.best_cost = float("inf")
+        self.best_path = None
+        self.stale = 0
+        self.iteration = 0
+        self.evaluations = 0
+        self.stop_reason = None
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def add_evaluations(self, count):
+        self.evaluations += count
+
+    def cancel(self):
+        self.cancelled = True
+
+    def expired(self):
+        """İç döngülerden çağrılabilen ucuz kontrol (iptal, süre ve değerlendirme bütçesi)."""
+        if self.cancelled:
+            self.stop_reason = "cancelled"
+        elif self.time_budget is not None and self.elapsed() >= self.time_budget:
+            self.stop_reason = "time_budget"
+        elif self.max_evaluations is not None and self.evaluations >= self.max_evaluations:
+            self.stop_reason = "max_evaluations"
+        return self.stop_reason is not None
+
+    def update(self, iteration, best_cost, best_path=None):
+        """
+        Her nesil/iterasyon sonunda çağrılır. Durulması gerekiyorsa True döner.
+        """
+        self.iteration = iteration + 1
+        if best_cost < self.best_cost:
+            self.best_cost = float(best_cost)
+            self.best_path = best_path
+            self.stale = 0
+        else:
+            self.stale += 1
+        if self.on_progress is not None:
+            self.on_progress(self)
+
+        if self.patience is not None and self.stale >= self.patience:
+            self.stop_reason = "stagnation"
+            return True
+        return self.expired()
+
+    def finish(self):
+        if self.stop_reason is None:
+            self.stop_reason = "completed"
+
+    def progress(self):
+        """Yakınsama anlık görüntüsü (yol kopyalanmaz, yalnızca referans)."""
+        return {
+            'iteration': self.iteration,
+            'best_cost': self.best_cost,
+            'best_path': self.best_path,
+            'evaluations': self.evaluations,
+            'elapsed_ms': self.elapsed() * 1000,
+        }
+
+    def report(self):
+        return {
+            'stop_reason': self.stop_reason,
+            'iterations': self.iteration,
+            'evaluations': self.evaluations,
+            'elapsed_ms': self.elapsed() * 1000,
+            'best_cost': self.best_cost,
+        }
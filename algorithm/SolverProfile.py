@@ -0,0 +1,92 @@
+import time
+
+
+class _Phase:
+    # Bir fazın toplam süresi ve çağrı sayısı. Aynı ad için tek nesne
+    # yeniden kullanılır (sıcak döngülerde her çağrıda nesne üretilmez);
+    # bu yüzden aynı ad kendi içinde iç içe açılmamalıdır.
+    __slots__ = ("total", "calls", "started")
+
+    def __init__(self):
+        self.total = 0.0
+        self.calls = 0
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.total += time.perf_counter() - self.started
+        self.calls += 1
+        return False
+
+
+class _NullPhase:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class SolverProfile:
+    """
+    İsteğe bağlı çözücü ölçümü: faz süreleri ve sayaçlar.
+
+    Çözücüye profile=SolverProfile() verilirse her çözümde sıfırlanır ve
+    sonuç run_info['profile'] olarak yola eşlik eder. Verilmezse kapalı
+    örnek (SolverProfile.OFF) kullanılır: phase() paylaşılan boş bir blok
+    döner, count() hiçbir şey yapmaz; ölçüm noktaları koşulsuz kalabilir.
+    Fazlar iç içe olabilir (örn. crossover kendi create_a_path çağrılarını
+    da içerir), süreler kapsayıcıdır.
+
+    Sayaçlar:
+    - shortest_path_queries: fix_path/create_a_path'teki en kısa yol sorguları
+    - dijkstra_runs: bu sorgular için gerçekten çalışan Dijkstra sayısı (önbellek ıskası)
+    - fitness_evaluations / fitness_cache_hits: puanlanan / önbellekten gelen yollar
+    - failed_paths: kurulamayan ya da onarılamayan yollar, hedefe varamayan karıncalar
+    """
+
+    OFF = None  # sınıf tanımından sonra atanır
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.reset()
+
+    def reset(self):
+        self.phases = {}    # ad -> _Phase
+        self.counters = {}
+
+    def phase(self, name):
+        """with profile.phase("fitness"): ... bloğunun süresini ölçer."""
+        if not self.enabled:
+            return _NULL_PHASE
+        phase = self.phases.get(name)
+        if phase is None:
+            phase = self.phases[name] = _Phase()
+        return phase
+
+    def count(self, name, amount=1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def report(self):
+        return {
+            'phases': {name: {'ms': phase.total * 1000, 'calls': phase.calls}
+                       for name, phase in self.phases.items()},
+            'counters': dict(self.counters),
+        }
+
+    def attach(self, run_info):
+        """Açıksa run_info sözlüğüne 'profile' anahtarını ekler ve onu döner."""
+        if self.enabled:
+            run_info['profile'] = self.report()
+        return run_info
+
+
+SolverProfile.OFF = SolverProfile(enabled=False)
@@ -0,0 +1,105 @@
+import threading
+from collections import OrderedDict
+
+
+class WarmStartStore:
+    """
+    Tekrarlanan sorgular için sıcak başlangıç deposu.
+
+    Anahtar: (graf sürümü, S, D). Değer: son ACO feromon vektörü ve/veya
+    GA'nın elit yolları. En eski kullanılan kayıt maxsize aşılınca atılır.
+    Aynı talep bulunamazsa ters yön (D, S) ve ardından ortak uç düğümlü
+    en yeni talep "yakın" talep olarak kullanılır.
+
+    Flask iş parçacıkları aynı depoyu paylaştığı için tüm genel metotlar
+    tek bir kilit altında çalışır; _entry/_lookup kilidin tutulduğunu varsayar.
+    """
+
+    def __init__(self, maxsize=64):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _entry(self, version, S, D):
+        key = (version, int(S), int(D))
+        if key not in self._data:
+            self._data[key] = {}
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+        return self._data[key]
+
+    def _lookup(self, version, S, D, field):
+        """(kayıt, yön) döner; yön 'exact', 'reverse' veya 'nearby'."""
+        S, D = int(S), int(D)
+        for key, relation in (((version, S, D), "exact"), ((version, D, S), "reverse")):
+            entry = self._data.get(key)
+            if entry and field in entry:
+                self._data.move_to_end(key)
+                return entry, relation, key
+        for key in reversed(self._data):
+            v, s, d = key
+            if v == version and field in self._data[key] and (s == S or d == D):
+                return self._data[key], "nearby", key
+        return None, None, None
+
+    # --- ACO ---
+    def save_pheromone(self, version, S, D, pheromone):
+        pheromone = pheromone.copy()
+        with self._lock:
+            self._entry(version, S, D)['pheromone'] = pheromone
+
+    def load_pheromone(self, version, S, D):
+        """Feromon vektörünün kopyası, yoksa None. Feromon yönsüz olduğundan ters talep de olur."""
+        with self._lock:
+            entry, _, _ = self._lookup(version, S, D, 'pheromone')
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            pheromone = entry['pheromone']
+        # Kayıtlar değiştirilmez, yalnızca yenisiyle değiştirilir; kopya kilit dışında alınabilir
+        return pheromone.copy()
+
+    # --- GA ---
+    def save_population(self, version, S, D, paths):
+        paths = [list(p) for p in paths]
+        with self._lock:
+            self._entry(version, S, D)['population'] = paths
+
+    def load_population(self, version, S, D):
+        """
+        S -> D yönüne çevrilmiş tohum yolları. Yakın talepten gelen yolların
+        farklı olan ucu değiştirilir; çağıran taraf yolları fix_path ile onarmalıdır.
+        """
+        with self._lock:
+            entry, relation, key = self._lookup(version, S, D, 'population')
+            if entry is None:
+                self.misses += 1
+                return []
+            self.hits += 1
+            paths = [list(p) for p in entry['population']]
+        if relation == "reverse":
+            return [p[::-1] for p in paths]
+        if relation == "nearby":
+            _, s, d = key
+            if s == int(S):
+                return [p[:-1] + [int(D)] for p in paths]
+            return [[int(S)] + p[1:] for p in paths]
+        return paths
+
+    def evict_version(self, version):
+        """Bir graf sürümüne ait tüm kayıtları siler."""
+        with self._lock:
+            for key in [k for k in self._data if k[0] == version]:
+                del self._data[key]
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._data)}
@@ -1,7 +1,10 @@
-from flask import Flask, render_template, request, jsonify
-import networkx as nx
+from flask import Flask, Response, render_template, request, jsonify, stream_with_context
+from collections import OrderedDict
+import gzip
+import json
 import math
 import os
+import threading
 import time  # <--- EKLENDİ (Süre hesabı için)
 
 # --- Senin Proje Dosyaların ---
@@ -9,12 +12,69 @@ from generate.TopologyGenerator import TopologyGenerator
 from generate.ReadData import ReadData
 from algorithm.GeneticAlgorithm import GeneticAlgorithm
 from algorithm.ACOAlgorithm import ACOAlgorithm
+from algorithm.ExactSolver import ExactSolver
 from algorithm.AlgorithmUtils import AlgorithmUtils
+from algorithm.WarmStartStore import WarmStartStore
+from algorithm.JobManager import JobManager
+from algorithm.SolverProfile import SolverProfile
+from model.GraphRegistry import GraphRegistry
+from model import GraphLayout
 
 app = Flask(__name__)
 
-# Global değişken
-network_graph = None
+# Yüklenen topolojiler: her biri dondurulmuş, sürümlü ve kimlikli.
+# İstekler graph_id ile (yoksa en son yüklenen) grafa sabitlenir.
+registry = GraphRegistry(max_graphs=4)
+# Tekrarlanan sorgular için feromon / elit popülasyon deposu
+warm_store = WarmStartStore(maxsize=64)
+# Pareto cepheleri: (graf sürümü, S, D, algoritma, min_bw) -> ParetoFront.
+# Aynı talep için farklı ağırlıklar yeniden arama yapmadan cepheden seçilir.
+# İstek iş parçacıkları paylaştığı için kilitli LRU (GraphLayout._cache gibi).
+pareto_fronts = OrderedDict()
+pareto_lock = threading.Lock()
+PARETO_CACHE_SIZE = 32
+# Uzun çözümler için sınırlı iş havuzu (/api/jobs)
+jobs = JobManager(max_workers=2)
+
+# Grafın yerleşim parametreleri (sürüm -> GraphLayout.get argümanları); görünüm sorguları aynı yerleşimi kullanır
+layout_options = {}
+# Ayrıntı düzeyi: bu sınırların üstünde tarayıcıya özet gönderilir,
+# ayrıntı /api/graphs/<id>/view ile yol ya da yakınlaştırılan bölge için istenir
+LOD_MAX_NODES = 2000
+LOD_MAX_EDGES = 4000
+LOD_MAX_CLUSTERS = 400
+LOD_DETAILS = ('auto', 'full', 'thin', 'cluster')
+
+def get_front(key):
+    """Önbellekteki cephe (son kullanılan olarak işaretlenir), yoksa None."""
+    with pareto_lock:
+        front = pareto_fronts.get(key)
+        if front is not None:
+            pareto_fronts.move_to_end(key)
+        return front
+
+def store_front(key, front):
+    with pareto_lock:
+        pareto_fronts[key] = front
+        pareto_fronts.move_to_end(key)
+        while len(pareto_fronts) > PARETO_CACHE_SIZE:
+            pareto_fronts.popitem(last=False)
+
+def evict_fronts(version):
+    with pareto_lock:
+        for key in [k for k in pareto_fronts if k[0] == version]:
+            del pareto_fronts[key]
+
+# Graf kayıttan düşünce ona bağlı önbellekler de temizlenir
+registry.on_evict(warm_store.evict_version)
+registry.on_evict(evict_fronts)
+registry.on_evict(GraphLayout.evict_version)
+registry.on_evict(lambda version: layout_options.pop(version, None))
+
+def pinned_graph(data):
+    """İstekteki graph_id'nin (yoksa geçerli) grafı; bulunamazsa None."""
+    return registry.get((data or {}).get('graph_id'))
+
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
 @app.route('/')
@@ -23,120 +83,343 @@ def index():
 
 @app.route('/api/generate', methods=['POST'])
 def generate_network():
-    global network_graph
     try:
         data = request.json
         source_type = data.get('type', 'random')
+        detail = data.get('detail', 'auto')
+        if detail not in LOD_DETAILS:
+            return jsonify({'success': False, 'message': f"Bilinmeyen ayrıntı düzeyi: {detail}"})
         
         if source_type == 'csv':
             csv_path = os.path.join(BASE_DIR, "documents", "BSM307_317_Guz2025_TermProject_EdgeData.csv")
             if not os.path.exists(csv_path):
                 return jsonify({'success': False, 'message': "CSV Dosyası Bulunamadı!"})
             
-            original_cwd = os.getcwd()
-            try:
-                os.chdir(BASE_DIR)
-                reader = ReadData()
-                network_graph = reader.read()
-            finally:
-                os.chdir(original_cwd)
+            # ReadData yolları proje köküne göre çözer, çalışma dizini değiştirmeye gerek yok
+            reader = ReadData()
+            graph = reader.read()
             
-            pos = nx.spring_layout(network_graph.nx_graph, seed=42)
+            options = {'seed': 42}
             msg = "CSV Verileri Yüklendi."
 
+        elif source_type == 'random_large':
+            # Coğrafi aile: düğümlerin kendi koordinatları yerleşim olarak kullanılır
+            gen = TopologyGenerator()
+            graph = gen.generate(num_nodes=10000, family="geographic", avg_degree=6)
+            options = {'seed': 42}
+            msg = "Büyük Rastgele Topoloji Oluşturuldu (10000 Node)."
+
         else:
+            # Üretici grafı tek geçişte bağlı hale getirir, tekrar denemeye gerek yok
             gen = TopologyGenerator()
-            for _ in range(10):
-                network_graph = gen.generate(num_nodes=250)
-                if nx.is_connected(network_graph.nx_graph):
-                    break
-            else:
-                G = network_graph.nx_graph
-                comps = list(nx.connected_components(G))
-                for i in range(len(comps)-1):
-                    G.add_edge(list(comps[i])[0], list(comps[i+1])[0], bandwidth=500, delay=5, reliability=0.99)
-            
-            pos = nx.spring_layout(network_graph.nx_graph, k=0.15, iterations=50, seed=42)
+            graph = gen.generate(num_nodes=250)
+            options = {'k': 0.15, 'iterations': 50, 'seed': 42}
             msg = "Rastgele Topoloji Oluşturuldu (250 Node)."
 
-        nodes = []
-        for n in network_graph.nx_graph.nodes():
-            node_obj = network_graph.get_node(n)
-            title = f"Node: {n}\nProc: {getattr(node_obj, 's_ms', 0):.2f}ms\nRel: {getattr(node_obj, 'reliability', 0):.4f}"
-            x_pos = pos[n][0] * 2500 
-            y_pos = pos[n][1] * 2500
-            nodes.append({'id': int(n), 'label': str(n), 'title': title, 'group': 'router', 'x': x_pos, 'y': y_pos})
-
-        edges = []
-        for u, v, data in network_graph.nx_graph.edges(data=True):
-            title = f"BW: {data.get('bandwidth',0):.1f} Mbps\nDelay: {data.get('delay',0):.1f}ms"
-            edges.append({'from': int(u), 'to': int(v), 'title': title})
-
-        return jsonify({'success': True, 'message': msg, 'data': {'nodes': nodes, 'edges': edges}})
+        # Yerleşim sürüm başına bir kez hesaplanır (anlık görüntü varsa diskte de saklanır)
+        layout_options[graph.version] = options
+        layout = GraphLayout.get(graph, **options)
+        graph_id = registry.register(graph, name=msg)
+        # Düğüm/kenar başına sözlük yerine sütunlu diziler; tooltip'ler /api/graphs/<id>/tooltip'ten
+        return json_response({'success': True, 'message': msg, 'graph_id': graph_id,
+                              'data': render_payload(graph, layout, detail)})
     
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)})
 
+def render_payload(graph, layout, detail='auto'):
+    """
+    Ayrıntı düzeyine göre yük: 'full' tüm graf, 'thin' bant genişliğine göre
+    seyreltilmiş kenarlar, 'cluster' ızgara kümeleri ve küme arası demetler.
+    'auto' boyuta göre seçer.
+    """
+    if detail == 'auto':
+        if graph.node_count() > LOD_MAX_NODES: detail = 'cluster'
+        elif graph.link_count() > LOD_MAX_EDGES: detail = 'thin'
+        else: detail = 'full'
+    if detail == 'cluster':
+        return GraphLayout.cluster_payload(graph, layout, LOD_MAX_CLUSTERS)
+    if detail == 'thin':
+        return GraphLayout.columnar_payload(graph, layout, edges=GraphLayout.thin_edges(graph, LOD_MAX_EDGES),
+                                           lod='thin')
+    return GraphLayout.columnar_payload(graph, layout)
+
+def graph_layout(graph):
+    return GraphLayout.get(graph, **layout_options.get(graph.version, {'seed': 42}))
+
+@app.route('/api/graphs/<graph_id>/view', methods=['GET'])
+def graph_view(graph_id):
+    """
+    Görünüm sorgusu: ?path=1,2,3 (yol ve hops komşuluğu) ve/veya
+    ?bbox=x0,y0,x1,y1 (yerleşim koordinatlarında bölge) için alt graf.
+    """
+    graph = registry.get(graph_id)
+    if graph is None:
+        return jsonify({'success': False, 'message': "Graf bulunamadı!"}), 404
+    try:
+        path = [int(v) for v in request.args.get('path', '').split(',') if v.strip()]
+        bbox = request.args.get('bbox')
+        if bbox:
+            bbox = [float(v) for v in bbox.split(',')]
+            if len(bbox) != 4: raise ValueError("bbox dört sayı olmalı")
+    except ValueError as e:
+        return jsonify({'success': False, 'message': f"Geçersiz parametre: {e}"}), 400
+    if not path and not bbox:
+        return jsonify({'success': False, 'message': "path ya da bbox gerekli."}), 400
+    hops = min(max(request.args.get('hops', 1, type=int), 0), 3)
+    max_edges = min(max(request.args.get('max_edges', LOD_MAX_EDGES, type=int), 1), LOD_MAX_EDGES)
+    payload = GraphLayout.view_payload(graph, graph_layout(graph), path=path, bbox=bbox or None,
+                                       hops=hops, max_edges=max_edges)
+    return json_response({'success': True, 'data': payload})
+
+@app.route('/api/graphs/<graph_id>/tooltip', methods=['GET'])
+def tooltip(graph_id):
+    """Tek düğüm (?node=id) ya da kenar (?edge=sıra) için açıklama metni."""
+    graph = registry.get(graph_id)
+    if graph is None:
+        return jsonify({'success': False, 'message': "Graf bulunamadı!"}), 404
+    cg = graph.compile()
+    if request.args.get('node') is not None:
+        n = request.args.get('node', type=int)
+        i = cg.index_of(n)
+        if i < 0:
+            return jsonify({'success': False, 'message': "Düğüm bulunamadı!"}), 404
+        title = f"Node: {n}\nProc: {cg.node_s_ms[i]:.2f}ms\nRel: {cg.node_reliability[i]:.4f}"
+    else:
+        e = request.args.get('edge', -1, type=int)
+        if not 0 <= e < cg.num_edges:
+            return jsonify({'success': False, 'message': "Kenar bulunamadı!"}), 404
+        title = f"BW: {cg.edge_bandwidth[e]:.1f} Mbps\nDelay: {cg.edge_delay[e]:.1f}ms"
+    return jsonify({'success': True, 'title': title})
+
+def json_response(payload):
+    """Büyük yanıtlar istemci destekliyorsa gzip ile sıkıştırılır."""
+    body = json.dumps(payload, separators=(',', ':')).encode("utf-8")
+    response = Response(body, mimetype='application/json')
+    if 'gzip' in request.headers.get('Accept-Encoding', ''):
+        response.set_data(gzip.compress(body, compresslevel=6))
+        response.headers['Content-Encoding'] = 'gzip'
+    response.headers['Vary'] = 'Accept-Encoding'
+    return response
+
+SOLVERS = {'ga': GeneticAlgorithm, 'aco': ACOAlgorithm, 'exact': ExactSolver}
+# Çok amaçlı arama yalnızca popülasyon/koloni tabanlı çözücülerde var
+PARETO_SOLVERS = {'ga': GeneticAlgorithm, 'aco': ACOAlgorithm}
+
+def make_solver(graph, data):
+    """İstekten çözücüyü ve solve() argümanlarını kurar: (solver, S, D, kwargs)."""
+    w1, w2, w3 = float(data['w1']), float(data['w2']), float(data['w3'])
+    if data['algo'] not in SOLVERS:
+        raise ValueError(f"Bilinmeyen algoritma: {data['algo']}")
+    store = warm_store if data.get('warm_start') else None
+    # İsteğe bağlı faz süreleri / sayaçlar (metrics['profile'])
+    profile = SolverProfile() if data.get('profile') else None
+    solver = SOLVERS[data['algo']](graph, w1, w2, w3, warm_start=store, profile=profile)
+    # İsteğe bağlı bant genişliği talebi: altındaki linkler aramaya girmez
+    kwargs = {'min_bandwidth': float(data.get('min_bw') or 0)}
+    return solver, int(data['s']), int(data['d']), kwargs
+
+def run_solve(graph, data, control=None):
+    """
+    Tek bir çözüm isteğini çalıştırır ve yanıt sözlüğünü döner.
+    control verilirse (arka plan işi) ilerleme/iptal onun üzerinden yürür.
+    """
+    solver, S, D, kwargs = make_solver(graph, data)
+    if control is None:
+        kwargs.update(solve_limits(data))
+
+    # --- ZAMAN BAŞLAT ---
+    start_time = time.time()
+
+    path = solver.solve(S, D, control=control, **kwargs)
+
+    # --- ZAMAN BİTİR ---
+    end_time = time.time()
+    duration = (end_time - start_time) * 1000 # ms cinsinden
+    return describe_path(graph, data, solver, path, duration)
+
+def describe_path(graph, data, solver, path, duration):
+    """Bulunan yolun dashboard'da gösterilen metrikleri."""
+    if not path:
+        return {'success': False, 'message': "Yol bulunamadı!"}
+    w1, w2, w3 = float(data['w1']), float(data['w2']), float(data['w3'])
+
+    # Sonuçları Hesapla
+    total_delay, rel_cost, bw_cost = AlgorithmUtils.calculate_metrics(graph, path)
+    real_reliability = math.exp(-rel_cost)
+    total_fitness = (w1 * total_delay) + (w2 * rel_cost * 100) + (w3 * bw_cost)
+
+    # Detaylı Bilgiler (Ekran Görüntüsündeki gibi)
+    bw_info = AlgorithmUtils.get_bandwidth(graph, path)
+    req_bw_info = AlgorithmUtils.get_required_bandwidth(graph, path)
+
+    metrics = {
+        'path': path,
+        'delay': f"{total_delay:.4f} ms",
+        'reliability': f"{real_reliability:.6f}",
+        'cost': f"{total_fitness:.4f}",
+        'steps': len(path) - 1,
+        # --- EKLENEN YENİ DETAYLAR ---
+        'duration': f"{duration:.2f} ms",
+        'rel_cost_log': f"{rel_cost:.4f}",
+        'bw_cost_inv': f"{bw_cost:.4f}",
+        'bw_detail': str(bw_info),
+        'req_bw': str(req_bw_info),
+        'stop_reason': solver.run_info['stop_reason'],
+        'iterations': solver.run_info['iterations']
+    }
+    if 'profile' in solver.run_info:
+        metrics['profile'] = solver.run_info['profile']
+    return {'success': True, 'metrics': metrics}
+
+def solve_limits(data):
+    # İsteğe bağlı gecikme bütçesi (ms): dashboard onlarca saniye beklemesin
+    budget_ms = float(data.get('time_budget_ms') or 0)
+    return {
+        'time_budget': budget_ms / 1000 if budget_ms > 0 else None,
+        'patience': int(data['patience']) if data.get('patience') else None,
+    }
+
 @app.route('/api/solve', methods=['POST'])
 def solve_path():
-    global network_graph
-    if not network_graph:
+    graph = pinned_graph(request.json)
+    if not graph:
         return jsonify({'success': False, 'message': "Önce ağı oluşturun!"})
 
     try:
-        data = request.json
-        S = int(data['s'])
-        D = int(data['d'])
+        return jsonify(run_solve(graph, request.json))
+
+    except Exception as e:
+        print(e)
+        return jsonify({'success': False, 'message': f"Hata: {str(e)}"})
+
+# --- Arka plan işleri: istek hemen iş numarası döner, çözüm havuzda sürer ---
+@app.route('/api/solve/stream', methods=['GET'])
+def solve_stream():
+    """
+    Server-Sent Events: her nesil/iterasyonda {iteration, best_cost, best_path,
+    evaluations, elapsed_ms} olayı, en sonda 'done' olayıyla metrikler.
+    Parametreler /api/solve ile aynıdır (sorgu dizesinde).
+    İstemci bağlantıyı kapatırsa arama da durur.
+    """
+    data = request.args.to_dict()
+    graph = pinned_graph(data)
+    if not graph:
+        return jsonify({'success': False, 'message': "Önce ağı oluşturun!"})
+
+    def events():
+        try:
+            solver, S, D, kwargs = make_solver(graph, data)
+            kwargs.update(solve_limits(data))
+            start_time = time.time()
+            if hasattr(solver, 'iter_solve'):
+                last_cost = None
+                for progress in solver.iter_solve(S, D, **kwargs):
+                    # Yol yalnızca iyileştiğinde gönderilir, diğer olaylar hafif kalır
+                    improved = progress['best_cost'] != last_cost
+                    last_cost = progress['best_cost']
+                    event = dict(progress, best_path=progress['best_path'] if improved else None,
+                                 best_cost=None if math.isinf(last_cost) else last_cost)
+                    yield f"data: {json.dumps(event)}\n\n"
+                path = solver.best_path
+            else:
+                path = solver.solve(S, D, **kwargs)
+            result = describe_path(graph, data, solver, path, (time.time() - start_time) * 1000)
+        except Exception as e:
+            print(e)
+            result = {'success': False, 'message': f"Hata: {str(e)}"}
+        yield f"event: done\ndata: {json.dumps(result)}\n\n"
+
+    return Response(stream_with_context(events()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache'})
+
+@app.route('/api/jobs', methods=['POST'])
+def submit_job():
+    data = request.json
+    # İş, gönderildiği andaki grafa sabitlenir (bu arada yeni ağ yüklense bile)
+    graph = pinned_graph(data)
+    if not graph:
+        return jsonify({'success': False, 'message': "Önce ağı oluşturun!"})
+    try:
+        job_id = jobs.submit(lambda control: run_solve(graph, data, control), **solve_limits(data))
+        return jsonify({'success': True, 'job_id': job_id})
+    except Exception as e:
+        print(e)
+        return jsonify({'success': False, 'message': f"Hata: {str(e)}"})
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """Durum ve nesil/iterasyon başına en iyi maliyet (since= ile yalnızca yeni kayıtlar)."""
+    status = jobs.status(job_id, since=request.args.get('since', 0, type=int))
+    if status is None:
+        return jsonify({'success': False, 'message': "İş bulunamadı!"}), 404
+    return jsonify({'success': True, **status})
+
+@app.route('/api/jobs/<job_id>/result', methods=['GET'])
+def job_result(job_id):
+    status, result = jobs.result(job_id)
+    if status is None:
+        return jsonify({'success': False, 'message': "İş bulunamadı!"}), 404
+    if result is None:
+        message = "Sonuç henüz hazır değil." if status in ("queued", "running") else "İş sonuç üretmeden bitti."
+        return jsonify({'success': False, 'status': status, 'message': message})
+    return jsonify({'status': status, **result})
+
+@app.route('/api/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    if not jobs.cancel(job_id):
+        return jsonify({'success': False, 'message': "İş bulunamadı!"}), 404
+    return jsonify({'success': True})
+
+@app.route('/api/pareto', methods=['POST'])
+def pareto():
+    """Tek çalıştırmada Pareto cephesi; istenen ağırlıkların yolu cepheden seçilir."""
+    data = request.json
+    graph = pinned_graph(data)
+    if not graph:
+        return jsonify({'success': False, 'message': "Önce ağ oluşturun!"})
+    try:
+        S, D = int(data['s']), int(data['d'])
         w1, w2, w3 = float(data['w1']), float(data['w2']), float(data['w3'])
         algo = data['algo']
+        if algo not in PARETO_SOLVERS:
+            raise ValueError(f"Pareto cephesi desteklenmeyen algoritma: {algo}")
+        min_bw = float(data.get('min_bw') or 0)
 
-        # --- ZAMAN BAŞLAT ---
         start_time = time.time()
+        key = (graph.version, S, D, algo, min_bw)
+        front = get_front(key)
+        cached = front is not None
+        if not cached:
+            front = PARETO_SOLVERS[algo](graph, w1, w2, w3).solve_pareto(S, D, min_bandwidth=min_bw)
+            store_front(key, front)
+        duration = (time.time() - start_time) * 1000
 
-        path = None
-        if algo == 'ga':
-            solver = GeneticAlgorithm(network_graph, w1, w2, w3)
-            # Parametreleri isteğe göre ayarlayabilirsin
-            path = solver.solve(S, D) 
-        elif algo == 'aco':
-            solver = ACOAlgorithm(network_graph, w1, w2, w3)
-            path = solver.solve(S, D)
-
-        # --- ZAMAN BİTİR ---
-        end_time = time.time()
-        duration = (end_time - start_time) * 1000 # ms cinsinden
-
+        path, objectives = front.select(w1, w2, w3)
         if not path:
             return jsonify({'success': False, 'message': "Yol bulunamadı!"})
 
-        # Sonuçları Hesapla
-        total_delay, rel_cost, bw_cost = AlgorithmUtils.calculate_metrics(network_graph, path)
-        real_reliability = math.exp(-rel_cost)
-        total_fitness = (w1 * total_delay) + (w2 * rel_cost * 100) + (w3 * bw_cost)
-
-        # Detaylı Bilgiler (Ekran Görüntüsündeki gibi)
-        bw_info = AlgorithmUtils.get_bandwidth(network_graph, path)
-        req_bw_info = AlgorithmUtils.get_required_bandwidth(network_graph, path)
-
+        total_delay, rel_cost, bw_cost = objectives
         metrics = {
             'path': path,
             'delay': f"{total_delay:.4f} ms",
-            'reliability': f"{real_reliability:.6f}",
-            'cost': f"{total_fitness:.4f}",
+            'reliability': f"{math.exp(-rel_cost):.6f}",
+            'cost': f"{(w1 * total_delay) + (w2 * rel_cost * 100) + (w3 * bw_cost):.4f}",
             'steps': len(path) - 1,
-            # --- EKLENEN YENİ DETAYLAR ---
             'duration': f"{duration:.2f} ms",
-            'rel_cost_log': f"{rel_cost:.4f}",
-            'bw_cost_inv': f"{bw_cost:.4f}",
-            'bw_detail': str(bw_info),
-            'req_bw': str(req_bw_info)
+            'front_size': len(front),
+            'cached': cached,
         }
-
-        return jsonify({'success': True, 'metrics': metrics})
+        return jsonify({'success': True, 'metrics': metrics, 'front': front.to_list()})
 
     except Exception as e:
         print(e)
         return jsonify({'success': False, 'message': f"Hata: {str(e)}"})
 
+@app.route('/api/graphs', methods=['GET'])
+def list_graphs():
+    """Kayıtlı topolojiler (kimlik, sürüm, boyut, geçerli olan)."""
+    return jsonify({'success': True, 'graphs': registry.list()})
+
 if __name__ == '__main__':
     app.run(debug=True, port=5000)
\ No newline at end of file
@@ -0,0 +1,277 @@
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from generate.ReadData import ReadData
+from generate.TopologyGenerator import TopologyGenerator
+from algorithm.GeneticAlgorithm import GeneticAlgorithm
+from algorithm.ACOAlgorithm import ACOAlgorithm
+from algorithm.ExactSolver import ExactSolver
+from algorithm.AlgorithmUtils import AlgorithmUtils
+from algorithm.SearchControl import SearchControl
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+HISTORY_PATH = os.path.join(BASE_DIR, "benchmark_history.jsonl")
+
+# Sabit topolojiler: CSV grafı ve üreticinin (tohum sabit) graf aileleri.
+# 250 düğüm panodaki rastgele topolojiyle aynıdır; büyüklerde p=0.4 yerine ortalama derece.
+TOPOLOGIES = {
+    "csv": None,
+    "gen250": {'num_nodes': 250},
+    "gen1k": {'num_nodes': 1000, 'avg_degree': 8},
+    "gen5k": {'num_nodes': 5000, 'avg_degree': 8},
+}
+WEIGHTS = (0.33, 0.33, 0.34)
+PAIRS = 10        # topoloji başına (S, D) çifti
+POOL_SIZE = 50    # mikro ölçümlerde kullanılan yol havuzu
+ANT_COUNT = 25
+# Mikrosaniyelik çağrılarda zamanlayıcı gürültüsü baskın olmasın diye
+# bir tekrar girdiler üzerinde en az bu kadar sürecek şekilde döndürülür
+MIN_ROUND_S = 0.05
+
+
+def load_topology(name, seed):
+    spec = TOPOLOGIES[name]
+    if spec is None:
+        return ReadData().read()
+    return TopologyGenerator().generate(seed=seed, **spec)
+
+
+def pick_pairs(graph, count, seed):
+    """Aynı bileşende, tohuma bağlı sabit (S, D) çiftleri."""
+    cg = graph.compile()
+    sp = cg.shortest_paths()
+    rng = np.random.default_rng(seed)
+    pairs = []
+    for _ in range(count * 20):
+        s, d = rng.integers(cg.num_nodes, size=2).tolist()
+        if s != d and sp.connected(s, d):
+            pairs.append((int(cg.node_ids[s]), int(cg.node_ids[d])))
+            if len(pairs) == count: break
+    return pairs
+
+
+def measure(fn, inputs, repeat, seed):
+    """
+    fn'i inputs'taki her argüman demeti için çağırır; bir tekrarın toplam
+    süresi çağrı sayısına bölünür (çağrı başına ms). Önbellekler ilk,
+    ölçülmeyen turda ısınır; bu tur kısa sürdüyse girdiler bir tekrarda
+    MIN_ROUND_S dolana kadar birkaç kez dolaşılır. Her tekrar aynı tohumla başlar.
+    """
+    def one_round(passes):
+        random.seed(seed)
+        np.random.seed(seed)
+        start = time.perf_counter()
+        for _ in range(passes):
+            for args in inputs:
+                fn(*args)
+        return (time.perf_counter() - start) * 1000 / (passes * len(inputs))
+
+    warm_ms = one_round(1) * len(inputs)
+    passes = max(1, int(np.ceil(MIN_ROUND_S * 1000 / max(warm_ms, 1e-6))))
+    runs = [one_round(passes) for _ in range(repeat)]
+    return {
+        'median_ms': statistics.median(runs),
+        'min_ms': min(runs),
+        'runs_ms': runs,
+        'calls': len(inputs) * passes,
+    }
+
+
+def topology_cases(graph, seed):
+    """(ölçüm adı, fonksiyon, girdi listesi) üçlüleri."""
+    random.seed(seed)
+    np.random.seed(seed)
+    pairs = pick_pairs(graph, PAIRS, seed)
+    ga = GeneticAlgorithm(graph, *WEIGHTS)
+    aco = ACOAlgorithm(graph, *WEIGHTS)
+    exact = ExactSolver(graph, *WEIGHTS)
+    cg = graph.compile()
+
+    # Yol havuzu: çiftler arasında GA'nın başlangıç yolları
+    pool = []
+    for S, D in pairs:
+        pool.extend(ga.initial_population(S, D, POOL_SIZE // len(pairs)))
+    # fix_path girdisi: ortadaki düğümü atılmış (boşluklu) yollar
+    broken = [p[:len(p) // 2] + p[len(p) // 2 + 1:] if len(p) > 3 else [p[0], p[-1]] for p in pool]
+    weight = aco.pheromone * aco.eta2
+    walks = [(cg, cg.index_of(S), cg.index_of(D)) for S, D in pairs]
+
+    return [
+        ("calculate_metrics", lambda p: AlgorithmUtils.calculate_metrics(graph, p), [(p,) for p in pool]),
+        ("fix_path", lambda p: AlgorithmUtils.fix_path(graph, p), [(p,) for p in broken]),
+        ("create_a_path", lambda S, D: AlgorithmUtils.create_a_path(graph, S, D), pairs),
+        ("ga_crossover", lambda p: ga.crossover(p, p[0], p[-1]), [(p,) for p in pool]),
+        ("ga_mutate", ga.mutate, [(p,) for p in pool]),
+        ("aco_walk_ants", lambda c, s, d: aco._walk(c, s, d, ANT_COUNT, weight, SearchControl()), walks),
+        ("aco_walk_lockstep", lambda c, s, d: aco._walk(c, s, d, ANT_COUNT, weight, SearchControl(), True),
+         walks),
+        ("solve_exact", lambda S, D: exact.solve(S, D), pairs),
+        # Tam çözümler çift başına pahalı olduğundan ilk üç çiftle
+        ("solve_ga", lambda S, D: GeneticAlgorithm(graph, *WEIGHTS).solve(S, D), pairs[:3]),
+        ("solve_aco", lambda S, D: ACOAlgorithm(graph, *WEIGHTS).solve(S, D), pairs[:3]),
+    ]
+
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR,
+                             capture_output=True, text=True, timeout=10)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_suite(seed=42, repeat=5, solve_repeat=3, topologies=None, only=None, label=None):
+    """
+    Tüm ölçümleri çalıştırır ve bir geçmiş kaydı (sözlük) döner.
+    Sonuç anahtarları "<topoloji>/<ölçüm>" biçimindedir.
+    """
+    topologies = topologies or list(TOPOLOGIES)
+    results = {}
+
+    def keep(name):
+        return only is None or any(part in name for part in only)
+
+    if "csv" in topologies:
+        reader = ReadData()
+        for name, fn in (("csv/read_data", reader.read), ("csv/parse_csv", reader.parse)):
+            if keep(name):
+                results[name] = measure(fn, [()], repeat, seed)
+                print(f"{name:<32} {results[name]['median_ms']:>10.3f} ms")
+
+    for topo in topologies:
+        graph = load_topology(topo, seed)
+        for case, fn, inputs in topology_cases(graph, seed):
+            name = f"{topo}/{case}"
+            if not keep(name) or not inputs: continue
+            results[name] = measure(fn, inputs, solve_repeat if case.startswith("solve_") else repeat, seed)
+            print(f"{name:<32} {results[name]['median_ms']:>10.3f} ms")
+
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        'commit': git_commit(),
+        'label': label,
+        'seed': seed,
+        'repeat': repeat,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': f"{platform.system()} {platform.machine()} ({os.cpu_count()} CPU)",
+        'results': results,
+    }
+
+
+def load_history(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def append_history(path, record):
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record, separators=(',', ':')) + "\n")
+
+
+def find_record(history, ref):
+    """ref: sıra numarası (negatif olabilir), commit ya da etiket."""
+    try:
+        return history[int(ref)]
+    except (ValueError, IndexError):
+        pass
+    for record in reversed(history):
+        if ref in (record.get('label'), record.get('commit')):
+            return record
+    raise KeyError(f"Geçmişte bulunamadı: {ref}")
+
+
+def compare(baseline, candidate, threshold=10.0, min_delta_ms=0.05):
+    """
+    Ortak ölçümlerin medyanlarını karşılaştırır. Yüzde değişim eşiği aşan
+    ve mutlak farkı min_delta_ms'den büyük yavaşlamalar gerileme sayılır
+    (çok kısa ölçümlerde gürültü eşiği). (satırlar, gerileme sayısı) döner.
+    """
+    rows, regressions = [], 0
+    for name, cand in candidate['results'].items():
+        base = baseline['results'].get(name)
+        if base is None: continue
+        old, new = base['median_ms'], cand['median_ms']
+        change = (new - old) / old * 100 if old > 0 else 0.0
+        if change > threshold and new - old > min_delta_ms:
+            status = "GERILEME"
+            regressions += 1
+        elif change < -threshold and old - new > min_delta_ms:
+            status = "iyilesme"
+        else:
+            status = ""
+        rows.append((name, old, new, change, status))
+    return rows, regressions
+
+
+def print_comparison(baseline, candidate, rows):
+    def describe(record):
+        return record.get('label') or record.get('commit') or record['timestamp']
+    print(f"Referans: {describe(baseline)}  ->  Aday: {describe(candidate)}")
+    print(f"{'Ölçüm':<32} {'Önce (ms)':>12} {'Sonra (ms)':>12} {'Değişim':>9}")
+    for name, old, new, change, status in rows:
+        print(f"{name:<32} {old:>12.3f} {new:>12.3f} {change:>+8.1f}% {status}")
+
+
+def run_compare(history_path, baseline_ref, candidate_ref, threshold, min_delta_ms):
+    history = load_history(history_path)
+    if len(history) < 2 and baseline_ref == "-2":
+        print("Karşılaştırma için en az iki kayıt gerekli.")
+        return 2
+    try:
+        baseline = find_record(history, baseline_ref)
+        candidate = find_record(history, candidate_ref)
+    except KeyError as e:
+        print(e.args[0])
+        return 2
+    rows, regressions = compare(baseline, candidate, threshold, min_delta_ms)
+    print_comparison(baseline, candidate, rows)
+    print(f"\n{regressions} gerileme (eşik %{threshold:g})")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Yönlendirme sıcak yolları için ölçüm ve gerileme takibi")
+    parser.add_argument("--history", default=HISTORY_PATH, help="JSON Lines geçmiş dosyası")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_p = sub.add_parser("run", help="ölçümleri çalıştırır ve geçmişe ekler")
+    run_p.add_argument("--seed", type=int, default=42)
+    run_p.add_argument("--repeat", type=int, default=5, help="mikro ölçüm tekrar sayısı")
+    run_p.add_argument("--solve-repeat", type=int, default=3, help="tam çözüm tekrar sayısı")
+    run_p.add_argument("--topologies", nargs="+", choices=list(TOPOLOGIES), default=None)
+    run_p.add_argument("--only", nargs="+", default=None, help="adında bu parçalar geçen ölçümler")
+    run_p.add_argument("--label", default=None, help="kayda etiket (örn. dal adı)")
+    run_p.add_argument("--no-save", action="store_true", help="geçmişe yazma")
+    run_p.add_argument("--compare", action="store_true", help="ardından bir önceki kayıtla karşılaştır")
+    run_p.add_argument("--threshold", type=float, default=10.0)
+
+    cmp_p = sub.add_parser("compare", help="iki kaydı karşılaştırır, gerileme varsa 1 ile çıkar")
+    cmp_p.add_argument("--baseline", default="-2", help="sıra, commit ya da etiket (varsayılan: sondan ikinci)")
+    cmp_p.add_argument("--candidate", default="-1", help="sıra, commit ya da etiket (varsayılan: son)")
+    cmp_p.add_argument("--threshold", type=float, default=10.0, help="yüzde yavaşlama eşiği")
+    cmp_p.add_argument("--min-delta-ms", type=float, default=0.05, help="bundan küçük farklar yok sayılır")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        record = run_suite(args.seed, args.repeat, args.solve_repeat, args.topologies, args.only, args.label)
+        if not args.no_save:
+            append_history(args.history, record)
+            print(f"\nKayıt eklendi: {args.history}")
+            if args.compare:
+                sys.exit(run_compare(args.history, "-2", "-1", args.threshold, 0.05))
+    else:
+        sys.exit(run_compare(args.history, args.baseline, args.candidate, args.threshold, args.min_delta_ms))
@@ -1,28 +1,158 @@
 import pandas as pd
 import numpy as np
+import argparse
+import os
 import time
 import math
 import random
+from concurrent.futures import ProcessPoolExecutor
 
 from generate.ReadData import ReadData
+from model.NetworkGraph import NetworkGraph
 from algorithm.GeneticAlgorithm import GeneticAlgorithm
 from algorithm.ACOAlgorithm import ACOAlgorithm
+from algorithm.ExactSolver import ExactSolver
 from algorithm.AlgorithmUtils import AlgorithmUtils
+from algorithm.SolverProfile import SolverProfile
 
+SOLVERS = {
+    "GA": GeneticAlgorithm,
+    "ACO": ACOAlgorithm,
+    "EXACT": ExactSolver,
+}
+# Kesin çözüm deterministiktir: senaryo başına bir kez çalışır ve
+# diğer algoritmaların sapması (gap) / hızlanması buna göre raporlanır
+BASELINE = "EXACT"
 
-def run_benchmarks(seed_value=42):
+# İşçi süreçlerde salt okunur graf (initializer ile süreç başına bir kez gelir)
+_worker_graph = None
+
+
+def _init_worker(graph):
+    """graph bir NetworkGraph ya da anlık görüntü dizini olabilir."""
+    global _worker_graph
+    if isinstance(graph, str):
+        # Her işçi aynı .npy dosyalarını eşler; sayfa önbelleği paylaşılır
+        graph = NetworkGraph.load_snapshot(graph)
+    _worker_graph = graph
+
+
+def job_seed(seed_value, scenario_idx, algo_name, repeat):
+    """
+    Her (senaryo, algoritma, tekrar) işi için sabit tohum.
+    İşçi sayısından bağımsız olduğu için sonuçlar tekrarlanabilir.
+    """
+    seq = np.random.SeedSequence([seed_value, scenario_idx, list(SOLVERS).index(algo_name), repeat])
+    return int(seq.generate_state(1)[0])
+
+
+def _run_job(job):
+    """
+    Tek bir çözümü çalıştırır: (yol, süre_ms, profil) döner.
+    Profil yalnızca profile=True ile istenmişse dolu, yoksa None.
+    """
+    S, D, B_req, algo_name, seed, weights, profile = job
+    random.seed(seed)
+    np.random.seed(seed)
+
+    start = time.time()
+    solver = SOLVERS[algo_name](_worker_graph, *weights, profile=SolverProfile() if profile else None)
+    # Talebi taşıyamayan linkler arama sırasında budanır
+    path = solver.solve(S, D, min_bandwidth=B_req)
+    end = time.time()
+    return path, (end - start) * 1000, solver.run_info.get('profile')
+
+
+def profile_columns(profiles):
+    """
+    Çalıştırmaların profillerinin ortalaması, rapor sütunları olarak:
+    Faz_<faz>_ms (kapsayıcı süre) ve Sayac_<sayaç>.
+    Bir çalıştırmada hiç görülmeyen faz/sayaç 0 kabul edilir.
+    """
+    if not profiles: return {}
+    phases = sorted({name for p in profiles for name in p['phases']})
+    counters = sorted({name for p in profiles for name in p['counters']})
+    columns = {}
+    for name in phases:
+        columns[f"Faz_{name}_ms"] = np.mean([p['phases'].get(name, {'ms': 0.0})['ms'] for p in profiles])
+    for name in counters:
+        columns[f"Sayac_{name}"] = np.mean([p['counters'].get(name, 0) for p in profiles])
+    return columns
+
+
+def build_jobs(demand_df, seed_value, total_scenarios, repeats, weights, profile=False):
+    """
+    Talep tablosunun ilk total_scenarios satırından iş listesi kurar.
+    (senaryolar, işler) döner; işler senaryo ve SOLVERS sırasındadır,
+    kesin çözüm senaryo başına bir, diğerleri repeats kez yer alır.
+    """
+    scenarios = []
+    jobs = []
+    for idx, row in demand_df.head(total_scenarios).iterrows():
+        S = int(row["src"])
+        D = int(row["dst"])
+        B_req = float(row["demand_mbps"])
+        scenarios.append((idx, S, D, B_req))
+        for algo_name in SOLVERS:
+            for r in range(1 if algo_name == BASELINE else repeats):
+                jobs.append((S, D, B_req, algo_name, job_seed(seed_value, idx, algo_name, r),
+                             weights, profile))
+    return scenarios, jobs
+
+
+def execute_jobs(graph, jobs, workers):
+    """İşleri workers>1 ise süreç havuzunda, değilse sırayla çalıştırır; sonuçlar iş sırasındadır."""
+    if workers > 1:
+        shared = graph.snapshot_path or graph
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(shared,)) as pool:
+            return list(pool.map(_run_job, jobs))
+    _init_worker(graph)
+    return [_run_job(job) for job in jobs]
+
+
+def check_workers(seed_value=42, workers=2, total_scenarios=5, repeats=2):
+    """
+    Aynı işleri önce tek süreçte sırayla, sonra workers süreçle çalıştırır
+    ve bulunan yolları karşılaştırır. Sonuçlar işçi sayısına ya da aynı
+    süreçte daha önce çalışan işlere bağlıysa farklar listelenir.
+    Hepsi aynıysa True döner.
+    """
+    graph = ReadData().read()
+    demand_df = pd.read_csv("BSM307_317_Guz2025_TermProject_DemandData.csv", sep=";")
+    _, jobs = build_jobs(demand_df, seed_value, total_scenarios, repeats, (0.5, 0.3, 0.2))
+
+    serial = execute_jobs(graph, jobs, 1)
+    parallel = execute_jobs(graph, jobs, workers)
+
+    mismatches = 0
+    for job, (path_1, _, _), (path_n, _, _) in zip(jobs, serial, parallel):
+        if path_1 != path_n:
+            mismatches += 1
+            S, D, B_req, algo_name = job[:4]
+            print(f"FARK {algo_name} {S}->{D} (B={B_req}): 1 işçi {path_1} / {workers} işçi {path_n}")
+    print(f"{len(jobs)} iş karşılaştırıldı, {mismatches} fark (1 işçi / {workers} işçi)")
+    return mismatches == 0
+
+
+def run_benchmarks(seed_value=42, workers=None, profile=False):
     """
     deney düzeneği
     - 20 (S, D, B) senaryosu
-    - 2 algoritma (GA, ACO)
+    - 2 algoritma (GA, ACO) + kesin çözüm (EXACT, referans)
     - 5 tekrar
     - ortalama, std, en iyi, en kötü
+    - kesin çözüme göre sapma (%) ve hızlanma
     - başarısız senaryolar 
+
+    İşler (S, D, B, algoritma, tohum) olarak bir süreç havuzuna dağıtılır.
+    workers=1 ise havuz kurulmadan sırayla çalışır. profile=True ise
+    çözücü faz süreleri ve sayaçları Faz_* / Sayac_* sütunlarına yazılır.
     """
 
     # Tekrarlanabilirlik
     random.seed(seed_value)
     np.random.seed(seed_value)
+    workers = workers or os.cpu_count() or 1
 
     try:
         reader = ReadData()
@@ -43,52 +173,46 @@ def run_benchmarks(seed_value=42):
     W_REL = 0.3
     W_RES = 0.2
 
-    print(f"Deney başlatıldı: {total_scenarios} senaryo × 2 algoritma × {repeats} tekrar")
+    print(f"Deney başlatıldı: {total_scenarios} senaryo × 2 algoritma × {repeats} tekrar + kesin çözüm ({workers} işçi)")
 
-    for idx, row in demand_df.head(total_scenarios).iterrows():
-        S = int(row["src"])
-        D = int(row["dst"])
-        B_req = float(row["demand_mbps"])
+    def runs_of(algo_name):
+        return 1 if algo_name == BASELINE else repeats
+
+    scenarios, jobs = build_jobs(demand_df, seed_value, total_scenarios, repeats,
+                                 (W_DELAY, W_REL, W_RES), profile)
+    outcomes = execute_jobs(graph, jobs, workers)
 
+    outcome_iter = iter(outcomes)
+    for idx, S, D, B_req in scenarios:
         print(f"[{idx+1}/{total_scenarios}] Senaryo {S}->{D} (B={B_req} Mbps)")
 
-        for algo_name, SolverClass in [
-            ("GA", GeneticAlgorithm),
-            ("ACO", ACOAlgorithm),
-        ]:
+        scenario_rows = {}
+        for algo_name in SOLVERS:
 
             costs = []
             delays = []
             reliability_costs = []
             resource_costs = []
             times = []
+            profiles = []
 
             invalid_count = 0
 
-            for r in range(repeats):
-                start = time.time()
-
-                solver = SolverClass(
-                    graph,
-                    w1=W_DELAY,
-                    w2=W_REL,
-                    w3=W_RES,
-                )
-
-                path = solver.solve(S, D)
-                end = time.time()
+            for r in range(runs_of(algo_name)):
+                path, elapsed_ms, run_profile = next(outcome_iter)
+                # Profil başarısız denemelerde de tutulur (süre oraya da harcanır)
+                if run_profile is not None:
+                    profiles.append(run_profile)
 
                 if not path:
                     invalid_count += 1
                     continue
 
-                # bandwidth kısıtı
-                feasible = True
-                for i in range(len(path) - 1):
-                    bw = graph.nx_graph.edges[path[i], path[i + 1]]["bandwidth"]
-                    if bw < B_req:
-                        feasible = False
-                        break
+                # bandwidth kısıtı (arama zaten budanmış graf üzerinde, burası son kontrol)
+                cg = graph.compile()
+                hops = cg.to_index(path)
+                eids = cg.edge_ids(hops[:-1], hops[1:])
+                feasible = bool((eids >= 0).all() and (cg.edge_bandwidth[eids] >= B_req).all())
 
                 if not feasible:
                     invalid_count += 1
@@ -109,41 +233,60 @@ def run_benchmarks(seed_value=42):
                 delays.append(total_delay)
                 reliability_costs.append(rel_cost)
                 resource_costs.append(res_cost)
-                times.append((end - start) * 1000)
+                times.append(elapsed_ms)
 
             if len(costs) > 0:
-                results.append(
-                    {
-                        "Senaryo": f"{S}->{D}",
-                        "Talep_B_Mbps": B_req,
-                        "Algoritma": algo_name,
-                        "Tekrar_Sayisi": repeats,
-                        "Gecerli_Deneme": len(costs),
-                        "Basarisiz_Deneme": invalid_count,
-                        "Ort_Maliyet": np.mean(costs),
-                        "Std_Maliyet": np.std(costs),
-                        "En_Iyi_Maliyet": np.min(costs),
-                        "En_Kotu_Maliyet": np.max(costs),
-                        "Ort_Gecikme_ms": np.mean(delays),
-                        "Ort_ReliabilityCost": np.mean(reliability_costs),
-                        "Ort_ResourceCost": np.mean(resource_costs),
-                        "Ort_Sure_ms": np.mean(times),
-                    }
-                )
+                scenario_rows[algo_name] = {
+                    "Senaryo": f"{S}->{D}",
+                    "Talep_B_Mbps": B_req,
+                    "Algoritma": algo_name,
+                    "Tekrar_Sayisi": runs_of(algo_name),
+                    "Gecerli_Deneme": len(costs),
+                    "Basarisiz_Deneme": invalid_count,
+                    "Ort_Maliyet": np.mean(costs),
+                    "Std_Maliyet": np.std(costs),
+                    "En_Iyi_Maliyet": np.min(costs),
+                    "En_Kotu_Maliyet": np.max(costs),
+                    "Ort_Gecikme_ms": np.mean(delays),
+                    "Ort_ReliabilityCost": np.mean(reliability_costs),
+                    "Ort_ResourceCost": np.mean(resource_costs),
+                    "Ort_Sure_ms": np.mean(times),
+                    **profile_columns(profiles),
+                }
             else:
-                results.append(
-                    {
-                        "Senaryo": f"{S}->{D}",
-                        "Talep_B_Mbps": B_req,
-                        "Algoritma": algo_name,
-                        "Hata": "Tüm tekrarlar bant genişliği veya yol kısıtı nedeniyle başarısız",
-                        "Basarisiz_Deneme": invalid_count,
-                    }
-                )
+                scenario_rows[algo_name] = {
+                    "Senaryo": f"{S}->{D}",
+                    "Talep_B_Mbps": B_req,
+                    "Algoritma": algo_name,
+                    "Hata": "Tüm tekrarlar bant genişliği veya yol kısıtı nedeniyle başarısız",
+                    "Basarisiz_Deneme": invalid_count,
+                    **profile_columns(profiles),
+                }
+
+        # Kesin çözüme göre sapma ve hızlanma
+        exact = scenario_rows.get(BASELINE, {})
+        optimum = exact.get("En_Iyi_Maliyet")
+        for algo_name, row in scenario_rows.items():
+            if optimum is not None and "Ort_Maliyet" in row:
+                row["Optimal_Maliyet"] = optimum
+                row["Ort_Sapma_Yuzde"] = (row["Ort_Maliyet"] - optimum) / optimum * 100
+                row["En_Iyi_Sapma_Yuzde"] = (row["En_Iyi_Maliyet"] - optimum) / optimum * 100
+                # Kesin çözüm bu algoritmadan kaç kat hızlı
+                row["Kesin_Hizlanma_Kat"] = row["Ort_Sure_ms"] / max(exact["Ort_Sure_ms"], 1e-9)
+            results.append(row)
 
     df = pd.DataFrame(results)
     df.to_csv("Deney_Raporu.csv", index=False, encoding="utf-8-sig")
     print("\n deney tamamlandı. Rapor oluşturuldu.")
 
 if __name__ == "__main__":
-    run_benchmarks()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workers", type=int, default=None, help="süreç sayısı (varsayılan: CPU sayısı)")
+    parser.add_argument("--profile", action="store_true", help="faz süreleri ve sayaçları rapora ekle")
+    parser.add_argument("--check-workers", type=int, default=None, metavar="N",
+                        help="rapor yerine 1 işçi ile N işçinin yollarını karşılaştır")
+    args = parser.parse_args()
+    if args.check_workers:
+        raise SystemExit(0 if check_workers(seed_value=args.seed, workers=args.check_workers) else 1)
+    run_benchmarks(seed_value=args.seed, workers=args.workers, profile=args.profile)
@@ -1,69 +1,91 @@
+import io
 import os
-from model.Node import Node
-from model.Link import Link
+import numpy as np
 from model.NetworkGraph import NetworkGraph
+from model import GraphSnapshot
+
+# Proje kök dizini (çalışma dizininden bağımsız yol çözümü için)
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 class ReadData:
     def __init__(self):
         # Dosya yollarını buraya güncelleyin
-       self.NODE_PATH = r"documents\BSM307_317_Guz2025_TermProject_NodeData.csv"
-       self.LINK_PATH = r"documents\BSM307_317_Guz2025_TermProject_EdgeData.csv"
-       self.DEMAND_PATH = r"documents\BSM307_317_Guz2025_TermProject_DemandData.csv"
+       self.NODE_PATH = os.path.join(BASE_DIR, "documents", "BSM307_317_Guz2025_TermProject_NodeData.csv")
+       self.LINK_PATH = os.path.join(BASE_DIR, "documents", "BSM307_317_Guz2025_TermProject_EdgeData.csv")
+       self.DEMAND_PATH = os.path.join(BASE_DIR, "documents", "BSM307_317_Guz2025_TermProject_DemandData.csv")
+       # Talep dosyası documents altında yoksa proje kökündeki kopya kullanılır
+       if not os.path.exists(self.DEMAND_PATH):
+           self.DEMAND_PATH = os.path.join(BASE_DIR, "BSM307_317_Guz2025_TermProject_DemandData.csv")
+       # Ayrıştırılmış topolojinin ikili anlık görüntüleri (kaynak özeti başına bir alt dizin; None ise kullanılmaz)
+       self.SNAPSHOT_DIR = os.path.join(BASE_DIR, "documents", ".snapshot")
+
+    @staticmethod
+    def read_table(path):
+        """
+        ';' ayraçlı, ondalık virgüllü CSV'yi başlığı atlayarak tek seferde
+        (satır x sütun) float64 dizisine çevirir.
+        """
+        with open(path, 'r', encoding='utf-8-sig') as f:
+            text = f.read().replace(",", ".")
+        return np.loadtxt(io.StringIO(text), delimiter=';', skiprows=1, ndmin=2)
 
     def read(self):
-        graph = NetworkGraph()
-        
         if not (os.path.exists(self.NODE_PATH) and os.path.exists(self.LINK_PATH)):
             raise FileNotFoundError("CSV dosyaları bulunamadı.")
 
+        # CSV'ler değişmediyse anlık görüntü bellek eşlemeli (mmap) açılır
+        if self.SNAPSHOT_DIR:
+            digest = GraphSnapshot.source_hash([self.NODE_PATH, self.LINK_PATH, self.DEMAND_PATH])
+            existing = GraphSnapshot.locate(self.SNAPSHOT_DIR, digest)
+            if existing:
+                try:
+                    return NetworkGraph.load_snapshot(existing)
+                except (OSError, ValueError):
+                    pass
+            graph = self.parse()
+            try:
+                # CSV değiştiyse yeni dizine yazılır; eski dizini eşleyen graflar etkilenmez
+                graph.snapshot_path = graph.save_snapshot(self.SNAPSHOT_DIR, digest)
+            except OSError:
+                pass  # yazılamıyorsa anlık görüntüsüz devam
+            return graph
+        return self.parse()
+
+    def parse(self):
+        """CSV dosyalarını ayrıştırır (anlık görüntüye bakmadan)."""
         # --- NODES ---
-        with open(self.NODE_PATH, 'r', encoding='utf-8-sig') as f:
-            lines = f.readlines()
-            for line in lines[1:]: # Başlığı atla
-                if not line.strip(): continue
-                
-                vals = line.strip().split(';')
-                # CSV formatına göre indexleri kontrol edin
-                n_id = int(vals[0].strip())
-                s_ms = float(vals[1].replace(",", "."))
-                # X ve Y koordinatları CSV'de yoksa rastgele atanabilir veya 0 geçilir
-                rel = float(vals[2].replace(",", ".")) if len(vals) > 2 else 0
-                
-                node = Node(n_id, reliability=rel,s_ms=s_ms)
-                graph.add_node(node)
+        nodes = self.read_table(self.NODE_PATH)
+        node_ids = nodes[:, 0].astype(np.int64)
+        s_ms = nodes[:, 1]
+        # Güvenilirlik sütunu yoksa 0 geçilir
+        rel = nodes[:, 2] if nodes.shape[1] > 2 else np.zeros(len(nodes))
 
         # --- LINKS ---
-        with open(self.LINK_PATH, 'r', encoding='utf-8-sig') as f:
-            lines = f.readlines()
-            for line in lines[1:]:
-                if not line.strip(): continue
-                vals = line.strip().split(';')
-                
-                src_id = int(vals[0])
-                dst_id = int(vals[1])
-                bw = float(vals[2].replace(",", "."))
-                delay = float(vals[3].replace(",", "."))
-                rel = float(vals[4].replace(",", "."))
+        links = self.read_table(self.LINK_PATH)
+        src_ids = links[:, 0].astype(np.int64)
+        dst_ids = links[:, 1].astype(np.int64)
+
+        # Yalnızca iki ucu da tanımlı düğüm olan linkler alınır
+        order = np.argsort(node_ids)
+        src_pos = np.minimum(np.searchsorted(node_ids[order], src_ids), len(order) - 1)
+        dst_pos = np.minimum(np.searchsorted(node_ids[order], dst_ids), len(order) - 1)
+        known = (node_ids[order][src_pos] == src_ids) & (node_ids[order][dst_pos] == dst_ids)
 
-                source_node = graph.get_node(src_id)
-                target_node = graph.get_node(dst_id)
+        # Link gecikmesine kaynak düğümün işlem süresi eklenir
+        total_delay = links[:, 3] + s_ms[order][src_pos]
 
-                if source_node and target_node:
-                    total_delay = delay + source_node.s_ms
-                    link = Link(source_node, target_node, total_delay, bw, rel)
-                    graph.add_link(link)
+        graph = NetworkGraph.from_columns(
+            node_ids, s_ms, rel,
+            src_ids[known], dst_ids[known], total_delay[known], links[known, 2], links[known, 4],
+        )
 
         # --- DEMANDS ---
         if os.path.exists(self.DEMAND_PATH):
             demands = {}
-            with open(self.DEMAND_PATH, 'r', encoding='utf-8-sig') as f:
-                lines = f.readlines()
-                for line in lines[1:]:
-                    if not line.strip(): continue
-                    vals = line.strip().split(';')
-                    key = vals[0].strip() + vals[1].strip()
-                    val = int(vals[2].strip())
-                    demands[key] = val
+            for src, dst, val in self.read_table(self.DEMAND_PATH).astype(np.int64).tolist():
+                demands[f"{src}{dst}"] = val
             graph.add_demands(demands)
 
-        return graph
\ No newline at end of file
+        # Algoritmaların kullanacağı dizi kopyası ve en kısa yol önbelleği
+        graph.compile().shortest_paths()
+        return graph
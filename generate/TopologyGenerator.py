@@ -1,44 +1,195 @@
-import networkx as nx
-import random
-from model.Node import Node
-from model.Link import Link
+import numpy as np
 from model.NetworkGraph import NetworkGraph
 
+# Görselleştirme koordinat aralığı (coğrafi ailede mesafe de buradan hesaplanır)
+COORD_LOW, COORD_HIGH = 10.0, 100.0
+
+
 class TopologyGenerator:
-    def generate(self, num_nodes=250, prob=0.4):
-        graph = NetworkGraph()
-        
-        # NetworkX kullanarak rastgele topoloji iskeleti oluştur
-        # Erdős-Rényi modeli (PDF Madde 2.1)
-        G_temp = nx.erdos_renyi_graph(num_nodes, prob, seed=42)
-
-        # Node'ları Model'e aktar
-        for n_id in G_temp.nodes():
-            # PDF Madde 2.2: Node Reliability [0.95 - 0.999]
-            rel = random.uniform(0.95, 0.999)
-            # PDF Madde 2.2: Processing Delay [0.5 ms - 2.0 ms]
-            s_ms = random.uniform(0.5, 2.0)
-            
-            node = Node(n_id, reliability=rel, s_ms=s_ms)
-            
-            # Görselleştirme için rastgele koordinat
-            node.x = random.uniform(10, 100)
-            node.y = random.uniform(10, 100)
-            graph.add_node(node)
-
-        # Link'leri Model'e aktar
-        for u, v in G_temp.edges():
-            src = graph.get_node(u)
-            dst = graph.get_node(v)
-            
-            # PDF Madde 2.3: Link Delay [3 ms - 15 ms]
-            delay = random.uniform(3, 15)
-            # PDF Madde 2.3: Bandwidth [100 Mbps - 1000 Mbps]
-            bw = random.uniform(100, 1000)
-            # PDF Madde 2.3: Link Reliability [0.95 - 0.999]
-            rel = random.uniform(0.95, 0.999)
-
-            link = Link(src, dst, delay, bw, rel)
-            graph.add_link(link)
-            
-        return graph
\ No newline at end of file
+    """
+    Rastgele ağ topolojisi üretici. Kenarlar O(n²) çift taraması yapılmadan
+    doğrudan örneklenir, tüm öznitelikler tohumlu bir NumPy Generator'dan
+    toplu çekilir ve graf tek geçişte bağlı hale getirilir.
+
+    Aileler:
+    - "gnp": Erdős-Rényi G(n, p) (PDF Madde 2.1), geometrik atlamalı örnekleme
+    - "bounded": her düğümün derecesi max_degree ile sınırlı rastgele graf
+    - "geographic": koordinatları yakın (yarıçap içindeki) düğümler bağlanır
+    """
+
+    FAMILIES = ("gnp", "bounded", "geographic")
+
+    def generate(self, num_nodes=250, prob=0.4, family="gnp", avg_degree=None,
+                 max_degree=None, seed=None):
+        """
+        avg_degree verilirse prob yerine ortalama derece hedeflenir
+        (büyük ağlarda p=0.4 milyonlarca link demektir).
+        seed verilmezse her çağrı yeni bir topoloji üretir; tekrarlanabilir
+        ölçümler (benchmark_runner) sabit tohum verir.
+        """
+        if family not in self.FAMILIES:
+            raise ValueError(f"Bilinmeyen topoloji ailesi: {family}")
+        rng = np.random.default_rng(seed)
+        n = int(num_nodes)
+        if avg_degree is None:
+            p, avg_degree = prob, prob * (n - 1)
+        else:
+            p = avg_degree / max(n - 1, 1)
+
+        # Görselleştirme (ve coğrafi aile) için koordinatlar
+        x = rng.uniform(COORD_LOW, COORD_HIGH, n)
+        y = rng.uniform(COORD_LOW, COORD_HIGH, n)
+
+        if family == "gnp":
+            src, dst = self._gnp_edges(n, p, rng)
+        elif family == "bounded":
+            if max_degree is None:
+                max_degree = max(int(np.ceil(2 * avg_degree)), 1)
+            src, dst = self._bounded_edges(n, avg_degree, max_degree, rng)
+        else:
+            src, dst = self._geographic_edges(x, y, avg_degree)
+
+        src, dst = self._connect(n, src, dst, rng)
+        m = len(src)
+
+        # PDF Madde 2.2: Node Reliability [0.95 - 0.999], Processing Delay [0.5 ms - 2.0 ms]
+        node_rel = rng.uniform(0.95, 0.999, n)
+        s_ms = rng.uniform(0.5, 2.0, n)
+        # PDF Madde 2.3: Link Delay [3 ms - 15 ms], Bandwidth [100 - 1000 Mbps], Reliability [0.95 - 0.999]
+        if family == "geographic":
+            # Gecikme mesafeyle orantılı (en uzak link 15 ms)
+            dist = np.hypot(x[src] - x[dst], y[src] - y[dst])
+            delay = 3 + 12 * dist / max(dist.max(initial=0.0), 1e-9)
+        else:
+            delay = rng.uniform(3, 15, m)
+        bw = rng.uniform(100, 1000, m)
+        link_rel = rng.uniform(0.95, 0.999, m)
+
+        graph = NetworkGraph.from_columns(
+            np.arange(n), s_ms, node_rel, src, dst, delay, bw, link_rel, node_x=x, node_y=y,
+        )
+        # Algoritmaların kullanacağı dizi kopyası ve en kısa yol önbelleği
+        graph.compile().shortest_paths()
+        return graph
+
+    @staticmethod
+    def _gnp_edges(n, p, rng):
+        """
+        G(n, p): alt üçgendeki n(n-1)/2 çiftin her biri p olasılıkla seçilir.
+        Seçilenler arasındaki boşluklar geometrik dağılımlı olduğundan yalnızca
+        seçilen çiftler üretilir (O(n + m)).
+        """
+        total = n * (n - 1) // 2
+        if p <= 0 or total == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        if p >= 1:
+            picks = np.arange(total, dtype=np.int64)
+        else:
+            chunks, last = [], -1
+            batch = int(total * p * 1.05) + 64
+            while last < total:
+                pos = last + np.cumsum(rng.geometric(p, batch))
+                chunks.append(pos)
+                last = int(pos[-1])
+            picks = np.concatenate(chunks)
+            picks = picks[picks < total]
+
+        # Doğrusal indeks k -> (i, j), j < i, k = i(i-1)/2 + j
+        i = ((1 + np.sqrt(1 + 8 * picks.astype(np.float64))) // 2).astype(np.int64)
+        # Kayan nokta yuvarlama hatası düzeltilir
+        i -= (i * (i - 1) // 2) > picks
+        i += ((i + 1) * i // 2) <= picks
+        j = picks - i * (i - 1) // 2
+        return i, j
+
+    @staticmethod
+    def _bounded_edges(n, avg_degree, max_degree, rng, rounds=20):
+        """
+        Derece sınırlı rastgele graf: boş kapasitesi kadar "yarım kenar" taşıyan
+        düğümler karıştırılıp ardışık olarak eşlenir; böylece hiçbir düğüm
+        max_degree'yi aşamaz. Hedef link sayısına ulaşılana dek tekrarlanır.
+        """
+        target = int(round(n * min(avg_degree, max_degree) / 2))
+        degree = np.zeros(n, dtype=np.int64)
+        keys = np.zeros(0, dtype=np.int64)
+        for _ in range(rounds):
+            need = target - len(keys)
+            if need <= 0: break
+            stubs = np.repeat(np.arange(n), max_degree - degree)
+            if len(stubs) < 2: break
+            rng.shuffle(stubs)
+            stubs = stubs[:len(stubs) // 2 * 2]
+            u, v = stubs[0::2], stubs[1::2]
+            ok = u != v
+            lo, hi = np.minimum(u[ok], v[ok]), np.maximum(u[ok], v[ok])
+            new = np.unique(lo * n + hi)
+            new = new[~np.isin(new, keys)]
+            new = rng.permutation(new)[:need]
+            if len(new) == 0: break
+            keys = np.concatenate((keys, new))
+            degree += np.bincount(new // n, minlength=n) + np.bincount(new % n, minlength=n)
+        return keys // n, keys % n
+
+    @staticmethod
+    def _geographic_edges(x, y, avg_degree):
+        """
+        Rastgele geometrik graf: aralarındaki mesafe yarıçaptan küçük olan
+        düğümler bağlanır. Yarıçap ortalama dereceden türetilir. Düğümler x'e
+        göre sıralanıp k. komşuyla karşılaştırılır; şerit dışına çıkınca durulur.
+        """
+        n = len(x)
+        if n < 2:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        side = COORD_HIGH - COORD_LOW
+        radius = side * np.sqrt(avg_degree / (np.pi * n))
+        order = np.argsort(x)
+        xs, ys = x[order], y[order]
+        src, dst = [], []
+        for k in range(1, n):
+            dx = xs[k:] - xs[:-k]
+            near = dx < radius
+            if not near.any(): break
+            dy = ys[k:] - ys[:-k]
+            hit = np.flatnonzero(near & (dx * dx + dy * dy < radius * radius))
+            src.append(order[hit])
+            dst.append(order[hit + k])
+        if not src:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        return np.concatenate(src), np.concatenate(dst)
+
+    @staticmethod
+    def components(n, src, dst):
+        """Bağlı bileşen etiketleri (her bileşenin en küçük düğüm indeksi)."""
+        labels = np.arange(n)
+        while True:
+            # Kökleri küçük etiketli komşuya bağla, sonra yolları sıkıştır
+            before = labels.copy()
+            ls, ld = labels[src], labels[dst]
+            np.minimum.at(labels, ls, ld)
+            np.minimum.at(labels, ld, ls)
+            while True:
+                jumped = labels[labels]
+                if np.array_equal(jumped, labels): break
+                labels = jumped
+            if np.array_equal(labels, before):
+                return labels
+
+    def _connect(self, n, src, dst, rng):
+        """
+        Bileşenleri tek geçişte zincirler. Her bileşenden en düşük dereceli
+        düğümlerden biri seçilir (derece sınırı mümkün olduğunca korunur).
+        """
+        src = np.asarray(src, dtype=np.int64)
+        dst = np.asarray(dst, dtype=np.int64)
+        if n < 2:
+            return src, dst
+        labels = self.components(n, src, dst)
+        roots, inverse = np.unique(labels, return_inverse=True)
+        if len(roots) == 1:
+            return src, dst
+        degree = np.bincount(src, minlength=n) + np.bincount(dst, minlength=n)
+        # Bileşen içinde dereceye, eşitlikte rastgele anahtara göre sıralayıp ilkini al
+        order = np.lexsort((rng.random(n), degree, inverse))
+        first = np.searchsorted(inverse[order], np.arange(len(roots)))
+        reps = rng.permutation(order[first])
+        return np.concatenate((src, reps[:-1])), np.concatenate((dst, reps[1:]))
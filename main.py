@@ -2,7 +2,10 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import networkx as nx
+from matplotlib.collections import LineCollection
+import numpy as np
+import queue
+import threading
 import time
 import math
 
@@ -11,13 +14,33 @@ from generate.ReadData import ReadData
 from generate.TopologyGenerator import TopologyGenerator
 from algorithm.GeneticAlgorithm import GeneticAlgorithm
 from algorithm.ACOAlgorithm import ACOAlgorithm  # ACO Eklendi
+from algorithm.ExactSolver import ExactSolver
 from algorithm.AlgorithmUtils import AlgorithmUtils
+from algorithm.SearchControl import SearchControl
+from model.GraphRegistry import GraphRegistry
+from model import GraphLayout
 
-# Global değişken
-network_graph = None
+# Yüklenen graf dondurulup kayda alınır; hesaplama o anki sürüme sabitlenir
+registry = GraphRegistry(max_graphs=2)
+
+SOLVERS = {
+    "GA (Genetik)": GeneticAlgorithm,
+    "ACO (Karınca)": ACOAlgorithm,
+    "Kesin (Dijkstra)": ExactSolver,
+}
+
+# Çizim durumu: yerleşim ve taban çizim (kenarlar, düğümler) graf yüklenince
+# bir kez kurulur. Yol yalnızca üst katmanda (animated artist'ler) güncellenir
+# ve blitting ile kaydedilmiş arka planın üzerine basılır.
+view = {'graph_id': None, 'cg': None, 'layout': None, 'ax': None,
+        'background': None, 'overlay': [], 'path': None}
+
+# Çözücü iş parçacığından gelen mesajlar; Tk ana döngüsünde window.after ile okunur
+results = queue.Queue()
+solving = {'control': None}
+POLL_MS = 50
 
 def load_graph():
-    global network_graph
     try:
         source_type = graph_source_var.get()
         if source_type == "Random":
@@ -29,40 +52,74 @@ def load_graph():
             network_graph = reader.read()
             msg = "CSV Verileri Yüklendi."
             
+        registry.register(network_graph, name=msg)
         # Ekrana çiz
         draw_graph()
-        log_message(f"{msg}\nNode Sayısı: {len(network_graph.nodes)}\nLink Sayısı: {len(network_graph.links)}")
+        log_message(f"{msg}\nNode Sayısı: {network_graph.node_count()}\nLink Sayısı: {network_graph.link_count()}")
         
     except Exception as e:
         messagebox.showerror("Hata", str(e))
 
-def draw_graph(path=None):
+def draw_graph():
+    """
+    Taban çizimi kurar: yerleşim sürüm başına bir kez hesaplanır (GraphLayout),
+    tüm kenarlar tek bir LineCollection olarak çizilir. Yol katmanı boş başlar.
+    """
+    network_graph = registry.get()
     if network_graph is None: return
-    
-    plt.clf()
-    G = network_graph.nx_graph
-    pos = nx.spring_layout(G, seed=42)
-    
-    nx.draw(G, pos, node_size=20, node_color='lightblue', with_labels=False)
-    
-    if path:
-        nx.draw_networkx_edges(G, pos, 
-                               edgelist=list(zip(path, path[1:])), 
-                               edge_color="red", width=2)
-        
-        if len(path) > 2:
-            intermediate_nodes = path[1:-1]
-            nx.draw_networkx_nodes(G, pos, nodelist=intermediate_nodes, 
-                                   node_color="red", node_size=30)
-            
-        nx.draw_networkx_nodes(G, pos, nodelist=[path[0]], 
-                               node_color="green", node_size=80)
-        
-        nx.draw_networkx_nodes(G, pos, nodelist=[path[-1]], 
-                               node_color="red", node_size=80)
-        
+
+    cg = network_graph.compile()
+    layout = GraphLayout.get(network_graph, seed=42)
+
+    fig.clf()
+    ax = fig.add_subplot(111)
+    ax.set_axis_off()
+    segments = np.stack([layout[cg.edge_src], layout[cg.edge_dst]], axis=1)
+    ax.add_collection(LineCollection(segments, colors="gray", linewidths=0.5, alpha=0.3))
+    ax.scatter(layout[:, 0], layout[:, 1], s=20, c="lightblue", zorder=2)
+    ax.autoscale_view()
+
+    # Yol katmanı: kırmızı kenarlar, ara düğümler, kaynak (yeşil) ve hedef (kırmızı)
+    overlay = [
+        LineCollection([], colors="red", linewidths=2, zorder=3, animated=True),
+        ax.scatter([], [], s=30, c="red", zorder=4, animated=True),
+        ax.scatter([], [], s=80, c="green", zorder=5, animated=True),
+        ax.scatter([], [], s=80, c="red", zorder=5, animated=True),
+    ]
+    ax.add_collection(overlay[0])
+
+    view.update(graph_id=registry.current_id(), cg=cg, layout=layout, ax=ax,
+                background=None, overlay=overlay, path=None)
+    # draw_event arka planı kaydeder (pencere boyutu değişince de)
     canvas.draw()
 
+def on_draw(event):
+    if view['ax'] is None: return
+    view['background'] = canvas.copy_from_bbox(view['ax'].bbox)
+    blit_overlay()
+
+def show_path(path):
+    """Yalnızca yol katmanını günceller; taban çizim yeniden çizilmez."""
+    if view['cg'] is None: return
+    view['path'] = path
+    edges, inner, source, target = view['overlay']
+    points = np.empty((0, 2))
+    if path:
+        index = view['cg'].to_index(path)
+        points = view['layout'][index[index >= 0]]
+    edges.set_segments(np.stack([points[:-1], points[1:]], axis=1) if len(points) > 1 else [])
+    inner.set_offsets(points[1:-1] if len(points) > 2 else np.empty((0, 2)))
+    source.set_offsets(points[:1])
+    target.set_offsets(points[-1:] if len(points) > 1 else np.empty((0, 2)))
+    blit_overlay()
+
+def blit_overlay():
+    if view['background'] is None: return
+    canvas.restore_region(view['background'])
+    for artist in view['overlay']:
+        view['ax'].draw_artist(artist)
+    canvas.blit(view['ax'].bbox)
+
 def log_message(msg):
     result_text.config(state="normal")
     result_text.delete(1.0, tk.END)
@@ -70,76 +127,119 @@ def log_message(msg):
     result_text.config(state="disabled")
 
 def calculate():
+    network_graph = registry.get()
     if network_graph is None:
         messagebox.showwarning("Uyarı", "Önce Grafiği Yükleyin!")
         return
+    if solving['control'] is not None:
+        return
         
+    # Girdileri Al
+    try:
+        S = int(entry_s.get())
+        D = int(entry_d.get())
+        w1 = float(entry_w1.get()) # Delay Ağırlığı
+        w2 = float(entry_w2.get()) # Reliability Ağırlığı
+        w3 = float(entry_w3.get()) # Bandwidth Ağırlığı
+    except ValueError:
+         messagebox.showerror("Hata", "Lütfen tüm alanlara sayısal değer girin.")
+         return
+
+    algo_name = algo_var.get()
+    graph_id = registry.current_id()
+
+    # Her iyileşmede en iyi yol ana döngüye iletilir (canlı çizim)
+    last_path = [None]
+    def on_progress(control):
+        if control.best_path is not None and control.best_path is not last_path[0]:
+            last_path[0] = control.best_path
+            results.put(('progress', graph_id, list(control.best_path)))
+
+    control = SearchControl(on_progress=on_progress)
+    solving['control'] = control
+    calc_button.config(state="disabled")
+    stop_button.config(state="normal")
+    log_message(f"{algo_name} çalışıyor: {S} -> {D} ...")
+    # Çözüm Tk ana iş parçacığı dışında çalışır, arayüz donmaz
+    threading.Thread(target=run_solver, daemon=True,
+                     args=(network_graph, graph_id, algo_name, S, D, w1, w2, w3, control)).start()
+    window.after(POLL_MS, poll_results)
+
+def run_solver(network_graph, graph_id, algo_name, S, D, w1, w2, w3, control):
     try:
-        # Girdileri Al
-        try:
-            S = int(entry_s.get())
-            D = int(entry_d.get())
-            w1 = float(entry_w1.get()) # Delay Ağırlığı
-            w2 = float(entry_w2.get()) # Reliability Ağırlığı
-            w3 = float(entry_w3.get()) # Bandwidth Ağırlığı
-        except ValueError:
-             messagebox.showerror("Hata", "Lütfen tüm alanlara sayısal değer girin.")
-             return
-
-        algo_name = algo_var.get()
-        
         # Algoritma Çalıştırma
         start_time = time.time()
-        path = None
-        
-        if algo_name == "GA (Genetik)":
-            solver = GeneticAlgorithm(network_graph, w1, w2, w3)
-            path = solver.solve(S, D)
-        elif algo_name == "ACO (Karınca)":
-            solver = ACOAlgorithm(network_graph, w1, w2, w3)
-            path = solver.solve(S, D)
-            
+        solver = SOLVERS[algo_name](network_graph, w1, w2, w3)
+        path = solver.solve(S, D, control=control)
         duration = (time.time() - start_time) * 1000 # ms cinsinden
-        
-        if not path:
-            log_message(f"{algo_name} ile {S}->{D} arasında yol bulunamadı.")
-            return
-
-        # Sonuç Hesaplama (AlgorithmUtils güncellendiği için burası doğru çalışacak)
-        total_delay, rel_cost, bw_cost = AlgorithmUtils.calculate_metrics(network_graph, path)
-        
-        # Toplam Skor (Fitness)
-        # Not: Reliability ve BW cost değerleri logaritmik/ters olduğu için
-        # ağırlıklarla direkt çarpmak bazen dengesiz olabilir ama PDF'teki "Weighted Sum" formülü bu.
-        total_fitness = (w1 * total_delay) + (w2 * rel_cost * 100) + (w3 * bw_cost)
-        
-        # Ekrana basılacak gerçek güvenilirlik değeri (Cost'tan geri dönüşüm)
-        # Cost = -ln(R)  =>  R = e^(-Cost)
-        real_reliability = math.exp(-rel_cost)
-        
-        bw_info = AlgorithmUtils.get_bandwidth(network_graph, path)
-        
-        sb = f">>> SONUÇ ({algo_name}) <<<\n"
-        sb += f"Kaynak: {S} -> Hedef: {D}\n"
-        sb += f"Adım Sayısı: {len(path)-1}\n"
-        sb += f"Yol: {path}\n"
-        sb += f"Çalışma Süresi: {duration:.2f} ms\n"
-        sb += f"--------------------------------\n"
-        sb += f"Toplam Gecikme (Delay): {total_delay:.4f} ms\n"
-        sb += f"Toplam Güvenilirlik: {real_reliability:.6f}\n"
-        sb += f"Güvenilirlik Maliyeti (-log): {rel_cost:.4f}\n"
-        sb += f"Kaynak Maliyeti (1000/BW): {bw_cost:.4f}\n"
-        sb += f"--------------------------------\n"
-        sb += f"HESAPLANAN SKOR (Cost): {total_fitness:.4f}\n"
-        sb += f"Detay: {bw_info}\n"
-        sb += f"{AlgorithmUtils.get_required_bandwidth(network_graph, path)}\n"
-        
-        log_message(sb)
-        draw_graph(path)
-
+        text = describe_path(network_graph, algo_name, S, D, w1, w2, w3, path, duration)
+        results.put(('done', graph_id, path, text))
     except Exception as e:
-        log_message(f"Beklenmeyen Hata: {e}")
         print(e)
+        results.put(('done', graph_id, None, f"Beklenmeyen Hata: {e}"))
+
+def describe_path(network_graph, algo_name, S, D, w1, w2, w3, path, duration):
+    if not path:
+        return f"{algo_name} ile {S}->{D} arasında yol bulunamadı."
+
+    # Sonuç Hesaplama (AlgorithmUtils güncellendiği için burası doğru çalışacak)
+    total_delay, rel_cost, bw_cost = AlgorithmUtils.calculate_metrics(network_graph, path)
+    
+    # Toplam Skor (Fitness)
+    # Not: Reliability ve BW cost değerleri logaritmik/ters olduğu için
+    # ağırlıklarla direkt çarpmak bazen dengesiz olabilir ama PDF'teki "Weighted Sum" formülü bu.
+    total_fitness = (w1 * total_delay) + (w2 * rel_cost * 100) + (w3 * bw_cost)
+    
+    # Ekrana basılacak gerçek güvenilirlik değeri (Cost'tan geri dönüşüm)
+    # Cost = -ln(R)  =>  R = e^(-Cost)
+    real_reliability = math.exp(-rel_cost)
+    
+    bw_info = AlgorithmUtils.get_bandwidth(network_graph, path)
+    
+    sb = f">>> SONUÇ ({algo_name}) <<<\n"
+    sb += f"Kaynak: {S} -> Hedef: {D}\n"
+    sb += f"Adım Sayısı: {len(path)-1}\n"
+    sb += f"Yol: {path}\n"
+    sb += f"Çalışma Süresi: {duration:.2f} ms\n"
+    sb += f"--------------------------------\n"
+    sb += f"Toplam Gecikme (Delay): {total_delay:.4f} ms\n"
+    sb += f"Toplam Güvenilirlik: {real_reliability:.6f}\n"
+    sb += f"Güvenilirlik Maliyeti (-log): {rel_cost:.4f}\n"
+    sb += f"Kaynak Maliyeti (1000/BW): {bw_cost:.4f}\n"
+    sb += f"--------------------------------\n"
+    sb += f"HESAPLANAN SKOR (Cost): {total_fitness:.4f}\n"
+    sb += f"Detay: {bw_info}\n"
+    sb += f"{AlgorithmUtils.get_required_bandwidth(network_graph, path)}\n"
+    return sb
+
+def poll_results():
+    """Çözücü mesajlarını okur; çözüm sürdükçe kendini yeniden zamanlar."""
+    done = False
+    while True:
+        try:
+            message = results.get_nowait()
+        except queue.Empty:
+            break
+        kind, graph_id = message[0], message[1]
+        # Bu arada başka graf yüklendiyse yol eski yerleşime aittir, çizilmez
+        current = graph_id == view['graph_id']
+        if kind == 'progress':
+            if current: show_path(message[2])
+        else:
+            path, text = message[2], message[3]
+            log_message(text)
+            if current: show_path(path)
+            done = True
+    if done:
+        solving['control'] = None
+        calc_button.config(state="normal")
+        stop_button.config(state="disabled")
+    else:
+        window.after(POLL_MS, poll_results)
+
+def stop_solver():
+    if solving['control'] is not None:
+        solving['control'].cancel()
 
 # --- GUI BAŞLANGIÇ ---
 window = tk.Tk()
@@ -175,8 +275,8 @@ entry_d.pack(fill="x", pady=(0, 5))
 
 tk.Label(left, text="Algoritma:", bg="#f0f0f0").pack(anchor="w", pady=(5,0))
 algo_var = tk.StringVar()
-# SADECE GA VE ACO SEÇENEKLERİ
-combo = ttk.Combobox(left, textvariable=algo_var, values=["GA (Genetik)", "ACO (Karınca)"])
+# GA, ACO ve karşılaştırma için kesin çözüm
+combo = ttk.Combobox(left, textvariable=algo_var, values=["GA (Genetik)", "ACO (Karınca)", "Kesin (Dijkstra)"])
 combo.current(0)
 combo.pack(fill="x")
 
@@ -186,7 +286,10 @@ entry_w1 = tk.Entry(left); entry_w1.insert(0,"0.33"); entry_w1.pack(fill="x") #
 entry_w2 = tk.Entry(left); entry_w2.insert(0,"0.33"); entry_w2.pack(fill="x") # Reliability
 entry_w3 = tk.Entry(left); entry_w3.insert(0,"0.34"); entry_w3.pack(fill="x") # Resource
 
-tk.Button(left, text="HESAPLA", command=calculate, bg="blue", fg="white", font=("Arial", 12, "bold")).pack(fill="x", pady=20)
+calc_button = tk.Button(left, text="HESAPLA", command=calculate, bg="blue", fg="white", font=("Arial", 12, "bold"))
+calc_button.pack(fill="x", pady=(20, 5))
+stop_button = tk.Button(left, text="DURDUR", command=stop_solver, state="disabled")
+stop_button.pack(fill="x", pady=(0, 20))
 
 result_text = tk.Text(left, height=20, bg="#ddd", font=("Consolas", 9))
 result_text.pack(fill="both", expand=True)
@@ -195,5 +298,6 @@ result_text.pack(fill="both", expand=True)
 fig = plt.figure(figsize=(5,5))
 canvas = FigureCanvasTkAgg(fig, master=right)
 canvas.get_tk_widget().pack(fill="both", expand=True)
+canvas.mpl_connect('draw_event', on_draw)
 
 window.mainloop()
\ No newline at end of file
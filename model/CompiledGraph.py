@@ -0,0 +1,318 @@
+import threading
+from collections import OrderedDict
+import numpy as np
+from model.ShortestPathCache import ShortestPathCache
+
+
+class CompiledGraph:
+    """
+    NetworkGraph'ın dondurulmuş, dizi tabanlı (CSR) hali.
+    Algoritmalar her adımda NetworkX sözlüklerine gitmek yerine
+    bu NumPy dizileri üzerinden çalışır.
+
+    Düğümler 0..N-1 arası indekslerle, kenarlar 0..E-1 arası
+    yönsüz kenar numaralarıyla temsil edilir.
+    """
+
+    # Bellekte tutulan en fazla filtreli görünüm (her biri ayrı CSR ve yol önbelleği taşır)
+    MAX_VIEWS = 8
+
+    def __init__(self, node_ids, node_s_ms, node_reliability,
+                 edge_src, edge_dst, edge_delay, edge_bandwidth, edge_reliability,
+                 node_x=None, node_y=None):
+        node_ids = np.asarray(node_ids, dtype=np.int64)
+        order = np.argsort(node_ids, kind="stable")
+
+        # --- Düğüm dizileri (id'ye göre sıralı) ---
+        self.node_ids = node_ids[order]
+        self.node_s_ms = np.asarray(node_s_ms, dtype=np.float64)[order]
+        self.node_reliability = np.asarray(node_reliability, dtype=np.float64)[order]
+        self.num_nodes = len(self.node_ids)
+        # Görselleştirme koordinatları (rotalamada kullanılmaz, yerleşim ve anlık görüntü için)
+        self.node_x = np.zeros(self.num_nodes) if node_x is None else np.asarray(node_x, dtype=np.float64)[order]
+        self.node_y = np.zeros(self.num_nodes) if node_y is None else np.asarray(node_y, dtype=np.float64)[order]
+        # id'ler 0..N-1 ise id == indeks, dönüşüm gerekmez
+        self.identity = bool(np.array_equal(self.node_ids, np.arange(self.num_nodes)))
+        self._index = {int(n): i for i, n in enumerate(self.node_ids.tolist())}
+
+        # --- Kenar dizileri ---
+        src = self.to_index(edge_src)
+        dst = self.to_index(edge_dst)
+        delay = np.asarray(edge_delay, dtype=np.float64)
+        bandwidth = np.asarray(edge_bandwidth, dtype=np.float64)
+        reliability = np.asarray(edge_reliability, dtype=np.float64)
+
+        # Grafta olmayan uçlar ve kendine dönen kenarlar rotalamada işe yaramaz
+        keep = (src >= 0) & (dst >= 0) & (src != dst)
+        src, dst = src[keep], dst[keep]
+        delay, bandwidth, reliability = delay[keep], bandwidth[keep], reliability[keep]
+
+        # Aynı kenar iki kez eklendiyse NetworkX gibi sonuncusu geçerli olsun
+        lo, hi = np.minimum(src, dst), np.maximum(src, dst)
+        pair_key = lo * self.num_nodes + hi
+        _, last = np.unique(pair_key[::-1], return_index=True)
+        last = np.sort(len(pair_key) - 1 - last)
+
+        self.edge_src = lo[last]
+        self.edge_dst = hi[last]
+        self.edge_delay = delay[last]
+        self.edge_bandwidth = bandwidth[last]
+        self.edge_reliability = reliability[last]
+        self.num_edges = len(self.edge_src)
+
+        # Metriklerin kenar/düğüm başına sabit terimleri bir kez hesaplanır
+        self.edge_rel_cost = -np.log(self.edge_reliability + 1e-12)
+        self.edge_bw_cost = 1000.0 / (self.edge_bandwidth + 1e-9)
+        self.node_rel_cost = -np.log(self.node_reliability + 1e-12)
+
+        # --- CSR komşuluk (her kenar iki yönde) ---
+        self.min_bandwidth = 0.0
+        self.base = self
+        self._init_views()
+        self._build_adjacency(np.arange(self.num_edges))
+
+    def _init_views(self):
+        # eşik -> görünüm (LRU); eşikler grafta bulunan bant genişliği değerleridir
+        self._views = OrderedDict()
+        self._views_lock = threading.Lock()
+        self._bandwidth_levels = None
+
+    def _build_adjacency(self, edge_list):
+        """Verilen kenar numaralarından CSR komşuluk dizilerini kurar."""
+        rows = np.concatenate((self.edge_src[edge_list], self.edge_dst[edge_list]))
+        cols = np.concatenate((self.edge_dst[edge_list], self.edge_src[edge_list]))
+        eids = np.concatenate((edge_list, edge_list))
+        order = np.lexsort((cols, rows))
+
+        self.neighbors = cols[order]
+        self.half_edge_id = eids[order]
+        self.offsets = np.zeros(self.num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=self.num_nodes), out=self.offsets[1:])
+        # (satır, komşu) çiftleri sıralı olduğundan kenar araması ikili arama ile yapılır
+        self._hop_keys = rows[order] * self.num_nodes + self.neighbors
+        self._py_cache = {}
+        self._shortest_paths = None
+
+    def compile(self, min_bandwidth=0):
+        """
+        Bant genişliği min_bandwidth altındaki kenarları içermeyen görünüm.
+        Düğüm ve kenar dizileri (ve kenar numaraları) ana grafla ortaktır,
+        yalnızca komşuluk filtrelenir.
+
+        Eşik, ona eşit ya da ondan büyük ilk kenar bant genişliğine
+        yuvarlanır (aynı kenar kümesini veren eşikler tek görünümü paylaşır);
+        son kullanılan MAX_VIEWS görünüm saklanır.
+        """
+        base = self.base
+        if not min_bandwidth or min_bandwidth <= 0:
+            return base
+        with base._views_lock:
+            if base._bandwidth_levels is None:
+                base._bandwidth_levels = np.unique(base.edge_bandwidth)
+            levels = base._bandwidth_levels
+            i = int(np.searchsorted(levels, float(min_bandwidth), side="left"))
+            if i == 0:
+                return base  # eşik en küçük bant genişliğini aşmıyor, hiçbir kenar elenmiyor
+            threshold = float(levels[i]) if i < len(levels) else float("inf")
+            view = base._views.get(threshold)
+            if view is not None:
+                base._views.move_to_end(threshold)
+                return view
+
+            view = object.__new__(CompiledGraph)
+            view.__dict__.update(base.__dict__)
+            view.min_bandwidth = threshold
+            view._views = None
+            view._build_adjacency(np.flatnonzero(base.edge_bandwidth >= threshold))
+            base._views[threshold] = view
+            while len(base._views) > self.MAX_VIEWS:
+                base._views.popitem(last=False)
+            return view
+
+    @classmethod
+    def from_network_graph(cls, graph):
+        nodes = list(graph.nodes.values())
+        links = graph.links
+        return cls(
+            [n.id for n in nodes],
+            [n.s_ms for n in nodes],
+            [n.reliability for n in nodes],
+            [l.source.id for l in links],
+            [l.target.id for l in links],
+            [l.delay for l in links],
+            [l.bandwidth for l in links],
+            [l.reliability for l in links],
+            [n.x for n in nodes],
+            [n.y for n in nodes],
+        )
+
+    # Anlık görüntüye (snapshot) yazılan diziler
+    STATE_ARRAYS = (
+        "node_ids", "node_s_ms", "node_reliability", "node_rel_cost", "node_x", "node_y",
+        "edge_src", "edge_dst", "edge_delay", "edge_bandwidth", "edge_reliability",
+        "edge_rel_cost", "edge_bw_cost",
+        "offsets", "neighbors", "half_edge_id", "hop_keys",
+    )
+
+    def state(self):
+        """Grafı yeniden kurmaya yetecek tüm diziler (ad -> ndarray)."""
+        arrays = {name: getattr(self, name) for name in self.STATE_ARRAYS if name != "hop_keys"}
+        arrays["hop_keys"] = self._hop_keys
+        return arrays
+
+    @classmethod
+    def from_state(cls, arrays):
+        """
+        state() çıktısından sıralama/tekilleştirme yapmadan geri kurar.
+        Diziler kopyalanmaz; np.memmap verilirse sayfa önbelleği paylaşılır.
+        """
+        cg = object.__new__(cls)
+        for name in cls.STATE_ARRAYS:
+            if name != "hop_keys":
+                setattr(cg, name, arrays[name])
+        cg._hop_keys = arrays["hop_keys"]
+        cg.num_nodes = len(cg.node_ids)
+        cg.num_edges = len(cg.edge_src)
+        cg.identity = bool(np.array_equal(cg.node_ids, np.arange(cg.num_nodes)))
+        cg._index = {int(n): i for i, n in enumerate(cg.node_ids.tolist())}
+        cg.min_bandwidth = 0.0
+        cg.base = cg
+        cg._init_views()
+        cg._py_cache = {}
+        cg._shortest_paths = None
+        return cg
+
+    # --- id <-> indeks dönüşümleri ---
+    def index_of(self, node_id):
+        """Düğüm id'sinin indeksini döner, yoksa -1."""
+        return self._index.get(int(node_id), -1)
+
+    def to_index(self, node_id_list):
+        ids = np.asarray(node_id_list, dtype=np.int64)
+        if self.num_nodes == 0:
+            return np.full(ids.shape, -1, dtype=np.int64)
+        if self.identity:
+            return np.where((ids >= 0) & (ids < self.num_nodes), ids, -1)
+        pos = np.searchsorted(self.node_ids, ids)
+        pos = np.minimum(pos, self.num_nodes - 1)
+        return np.where(self.node_ids[pos] == ids, pos, -1)
+
+    def to_ids(self, index_list):
+        if self.identity:
+            return [int(i) for i in index_list]
+        return self.node_ids[np.asarray(index_list, dtype=np.int64)].tolist()
+
+    # --- Komşuluk ve kenar erişimi ---
+    def adjacency(self, u):
+        """u indeksli düğümün (komşu indeksleri, kenar numaraları) dilimi."""
+        a, b = self.offsets[u], self.offsets[u + 1]
+        return self.neighbors[a:b], self.half_edge_id[a:b]
+
+    def padded_adjacency(self):
+        """
+        Komşuluğu (N x maksimum derece) matrislerine yayar: komşu indeksleri,
+        kenar numaraları ve geçerlilik maskesi. Toplu (vektörel) adımlar için.
+        """
+        if "padded" not in self._py_cache:
+            degree = np.diff(self.offsets)
+            width = max(int(degree.max()) if self.num_nodes else 0, 1)
+            rows = np.repeat(np.arange(self.num_nodes), degree)
+            cols = np.arange(len(self.neighbors)) - self.offsets[rows]
+            nbrs = np.zeros((self.num_nodes, width), dtype=np.int64)
+            eids = np.zeros((self.num_nodes, width), dtype=np.int64)
+            valid = np.zeros((self.num_nodes, width), dtype=bool)
+            nbrs[rows, cols] = self.neighbors
+            eids[rows, cols] = self.half_edge_id
+            valid[rows, cols] = True
+            self._py_cache["padded"] = (nbrs, eids, valid)
+        return self._py_cache["padded"]
+
+    def edge_ids(self, u, v):
+        """
+        (u[i], v[i]) indeks çiftlerinin kenar numaraları.
+        Kenar yoksa -1 döner.
+        """
+        u = np.asarray(u, dtype=np.int64)
+        v = np.asarray(v, dtype=np.int64)
+        result = np.full(u.shape, -1, dtype=np.int64)
+        if len(self._hop_keys) == 0:
+            return result
+        valid = (u >= 0) & (v >= 0)
+        keys = u[valid] * self.num_nodes + v[valid]
+        pos = np.minimum(np.searchsorted(self._hop_keys, keys), len(self._hop_keys) - 1)
+        found = self._hop_keys[pos] == keys
+        result[np.flatnonzero(valid)[found]] = self.half_edge_id[pos[found]]
+        return result
+
+    def pack_paths(self, paths):
+        """
+        Farklı uzunluktaki id yollarını (offsets, indeksler) dizilerine paketler.
+        paths[i] yolu indices[offsets[i]:offsets[i+1]] aralığındadır.
+        """
+        lengths = np.fromiter((len(p) if p else 0 for p in paths), dtype=np.int64, count=len(paths))
+        offsets = np.zeros(len(paths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        flat = [n for p in paths if p for n in p]
+        return offsets, self.to_index(np.asarray(flat, dtype=np.int64))
+
+    def path_metrics(self, offsets, indices):
+        """
+        Paketlenmiş yolların (gecikme, güvenilirlik maliyeti, bant genişliği maliyeti)
+        vektörleri. Grafta olmayan adımlar/düğümler katkı vermez, boş yollar inf olur.
+        """
+        count = len(offsets) - 1
+        lengths = np.diff(offsets)
+        owner = np.repeat(np.arange(count), lengths)
+        first = np.zeros(len(indices), dtype=bool)
+        last = np.zeros(len(indices), dtype=bool)
+        nonempty = lengths > 0
+        first[offsets[:-1][nonempty]] = True
+        last[offsets[1:][nonempty] - 1] = True
+
+        def total(owners, weights):
+            # Girdi boşsa bincount int64 döner; toplamlar her zaman float olmalı
+            return np.bincount(owners, weights=weights, minlength=count).astype(np.float64, copy=False)
+
+        # 1. Kenarlar: yolun son elemanı bir sonraki yola bağlanmaz
+        hop = ~last[:-1]
+        eids = self.edge_ids(indices[:-1][hop], indices[1:][hop])
+        found = eids >= 0
+        hop_owner = owner[:-1][hop][found]
+        eids = eids[found]
+        delay = total(hop_owner, self.edge_delay[eids])
+        rel = total(hop_owner, self.edge_rel_cost[eids])
+        bw = total(hop_owner, self.edge_bw_cost[eids])
+
+        # 2. Ara düğümler: işlem süresi + güvenilirlik
+        known = indices >= 0
+        inner = known & ~first & ~last
+        delay += total(owner[inner], self.node_s_ms[indices[inner]])
+        rel += total(owner[inner], self.node_rel_cost[indices[inner]])
+
+        # Uç düğümler (tek düğümlü yolda aynı düğüm iki kez sayılır)
+        for mask in (known & first, known & last):
+            rel += total(owner[mask], self.node_rel_cost[indices[mask]])
+
+        for arr in (delay, rel, bw):
+            arr[~nonempty] = np.inf
+        return delay, rel, bw
+
+    def _python_adjacency(self, weight):
+        # Python döngüleri NumPy skalerleriyle yavaş çalışır,
+        # her düğüm için (komşu, ağırlık) listesi bir kez üretilir
+        if weight not in self._py_cache:
+            w = self.edge_delay if weight == "delay" else self.edge_bandwidth
+            nbrs = self.neighbors.tolist()
+            ws = w[self.half_edge_id].tolist()
+            offsets = self.offsets.tolist()
+            self._py_cache[weight] = [
+                list(zip(nbrs[offsets[u]:offsets[u + 1]], ws[offsets[u]:offsets[u + 1]]))
+                for u in range(self.num_nodes)
+            ]
+        return self._py_cache[weight]
+
+    def shortest_paths(self):
+        """Bu grafa ait en kısa yol önbelleği (ilk ihtiyaçta kurulur)."""
+        if self._shortest_paths is None:
+            self._shortest_paths = ShortestPathCache(self)
+        return self._shortest_paths
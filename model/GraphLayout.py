@@ -0,0 +1,245 @@
+import base64
+import os
+import threading
+from collections import OrderedDict
+import networkx as nx
+import numpy as np
+from model import GraphSnapshot
+
+# Bellekteki yerleşimler: (graf sürümü, parametreler) -> (N x 2) dizi
+_cache = OrderedDict()
+_lock = threading.Lock()
+MAX_CACHED = 16
+# Bundan büyük graflarda yay yerleşimi yerine üreticinin koordinatları kullanılır
+SPRING_LIMIT = 2000
+
+
+def _params_key(k, iterations, seed):
+    return f"k{k}_i{iterations}_s{seed}"
+
+
+def _disk_path(graph, params):
+    """Anlık görüntüden yüklenen graf için yerleşim dosyası (kaynak özetine bağlı)."""
+    if not graph.snapshot_path:
+        return None
+    manifest = GraphSnapshot.read_manifest(graph.snapshot_path)
+    digest = (manifest or {}).get("source_hash")
+    if not digest:
+        return None
+    return os.path.join(graph.snapshot_path, f"layout_{digest[:16]}_{params}.npy")
+
+
+def compute(graph, k=None, iterations=50, seed=42):
+    """
+    Yay (spring) yerleşimi, derlenmiş düğüm sırasında (N x 2).
+    Node/Link görünümleri üretilmeden yalnızca kenar dizilerinden kurulur.
+    """
+    cg = graph.compile()
+    ids = cg.node_ids.tolist()
+    G = nx.Graph()
+    G.add_nodes_from(ids)
+    G.add_edges_from(zip(cg.node_ids[cg.edge_src].tolist(), cg.node_ids[cg.edge_dst].tolist()))
+    pos = nx.spring_layout(G, k=k, iterations=iterations, seed=seed)
+    return np.array([pos[i] for i in ids], dtype=np.float64).reshape(-1, 2)
+
+
+def coordinates(graph):
+    """
+    Düğümlerin kendi x/y koordinatları, [-1, 1] aralığına ölçeklenmiş
+    (derlenmiş düğüm sırasında). Hepsi aynı noktadaysa None.
+    """
+    cg = graph.compile()
+    # Sütunlar doğrudan okunur; büyük graflarda Node görünümleri üretilmez
+    xy = np.column_stack((cg.node_x, cg.node_y)).astype(np.float64, copy=False)
+    if len(xy) == 0:
+        return None
+    center = (xy.max(axis=0) + xy.min(axis=0)) / 2
+    scale = np.abs(xy - center).max()
+    return (xy - center) / scale if scale > 0 else None
+
+
+def get(graph, k=None, iterations=50, seed=42):
+    """
+    Grafın yerleşimi. Aynı sürüm için bir kez hesaplanır; graf bir anlık
+    görüntüden geldiyse dosyaya da yazılır ve sonraki yüklemelerde okunur.
+    """
+    params = _params_key(k, iterations, seed)
+    key = (graph.version, params)
+    with _lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+
+    path = _disk_path(graph, params)
+    layout = None
+    if path and os.path.exists(path):
+        try:
+            layout = np.load(path)
+            if layout.shape != (graph.node_count(), 2):
+                layout = None
+        except (OSError, ValueError):
+            layout = None
+    if layout is None and graph.node_count() > SPRING_LIMIT:
+        layout = coordinates(graph)
+    if layout is None:
+        layout = compute(graph, k, iterations, seed)
+        if path:
+            try:
+                # Geçici dosyaya yazılıp taşınır; okuyan başka iş parçacığı yarım dosya görmez
+                tmp = f"{path}.{threading.get_ident()}.tmp"
+                with open(tmp, "wb") as f:
+                    np.save(f, layout)
+                os.replace(tmp, path)
+            except OSError:
+                pass  # yazılamıyorsa yalnızca bellekte tutulur
+
+    with _lock:
+        _cache[key] = layout
+        while len(_cache) > MAX_CACHED:
+            _cache.popitem(last=False)
+    return layout
+
+
+def evict_version(version):
+    """Bir graf sürümünün yerleşimlerini bellekten atar (GraphRegistry.on_evict için)."""
+    with _lock:
+        for key in [key for key in _cache if key[0] == version]:
+            del _cache[key]
+
+
+def _pack(array, dtype):
+    return {'dtype': np.dtype(dtype).name,
+            'data': base64.b64encode(np.ascontiguousarray(array, dtype=dtype).tobytes()).decode("ascii")}
+
+
+def _index_dtype(n):
+    return "<u2" if n < 1 << 16 else "<u4"
+
+
+def columnar_payload(graph, layout, nodes=None, edges=None, lod="full"):
+    """
+    Dashboard için sütunlu, tipli dizi dostu yük (küçük-endian, base64):
+    node_ids, x, y, kenar uçları (düğüm dizisindeki sıra) ve kenar numaraları.
+    nodes/edges verilirse yalnızca o düğüm indeksleri ve kenarlar gönderilir;
+    kenarların iki ucu da nodes içinde olmalıdır. Ayrıntılar (tooltip) ayrıca istenir.
+    """
+    cg = graph.compile()
+    nodes = np.arange(cg.num_nodes) if nodes is None else np.asarray(nodes, dtype=np.int64)
+    edges = np.arange(cg.num_edges) if edges is None else np.asarray(edges, dtype=np.int64)
+    position = np.full(cg.num_nodes, -1, dtype=np.int64)
+    position[nodes] = np.arange(len(nodes))
+    index_dtype = _index_dtype(len(nodes))
+    return {
+        'format': 'columnar',
+        'lod': lod,
+        'num_nodes': int(len(nodes)),
+        'num_edges': int(len(edges)),
+        'total_nodes': int(cg.num_nodes),
+        'total_edges': int(cg.num_edges),
+        'node_ids': _pack(cg.node_ids[nodes], "<i4"),
+        'x': _pack(layout[nodes, 0], "<f4"),
+        'y': _pack(layout[nodes, 1], "<f4"),
+        'edge_src': _pack(position[cg.edge_src[edges]], index_dtype),
+        'edge_dst': _pack(position[cg.edge_dst[edges]], index_dtype),
+        'edge_ids': _pack(edges, "<u4"),
+    }
+
+
+# --- Ayrıntı düzeyi (level of detail) ---
+def thin_edges(graph, max_edges):
+    """
+    Bant genişliği en yüksek max_edges kenar (artan sırada numaralar).
+    Her düğümün en güçlü kenarı da tutulur, böylece hiçbir düğüm kopuk görünmez.
+    """
+    cg = graph.compile()
+    order = np.argsort(-cg.edge_bandwidth, kind="stable")
+    selected = np.zeros(cg.num_edges, dtype=bool)
+    selected[order[:max_edges]] = True
+    # Azalan BW sırasında her düğümün ilk göründüğü kenar en güçlüsüdür
+    ends = np.concatenate([cg.edge_src[order], cg.edge_dst[order]])
+    _, first = np.unique(ends, return_index=True)
+    if cg.num_edges:
+        selected[order[first % cg.num_edges]] = True
+    return np.flatnonzero(selected)
+
+
+def cluster_payload(graph, layout, max_clusters=400):
+    """
+    Düğümler yerleşim üzerinde ızgara hücrelerine toplanır (yakın düğümler
+    yay yerleşiminde aynı topluluktadır). Her küme merkez noktası ve üye
+    sayısıyla, kümeler arası kenarlar tek bir demet olarak gönderilir:
+    weight demetteki link sayısı, bandwidth en güçlü linkin BW'si.
+    Düğüm numaraları küme numaralarıdır; node_cluster her gerçek düğümün
+    kümesini verir (node_ids sırasında).
+    """
+    cg = graph.compile()
+    cells = max(1, int(np.sqrt(max_clusters)))
+    lo, hi = layout.min(axis=0), layout.max(axis=0)
+    span = np.where(hi > lo, hi - lo, 1.0)
+    cell = np.minimum(((layout - lo) / span * cells).astype(np.int64), cells - 1)
+    _, label, size = np.unique(cell[:, 0] * cells + cell[:, 1], return_inverse=True, return_counts=True)
+    label = label.reshape(-1)
+    k = len(size)
+    cx = np.bincount(label, weights=layout[:, 0], minlength=k) / size
+    cy = np.bincount(label, weights=layout[:, 1], minlength=k) / size
+
+    a, b = label[cg.edge_src], label[cg.edge_dst]
+    between = a != b
+    lo_c, hi_c = np.minimum(a, b)[between], np.maximum(a, b)[between]
+    bundles, bundle_of, weight = np.unique(lo_c * k + hi_c, return_inverse=True, return_counts=True)
+    bandwidth = np.zeros(len(bundles))
+    np.maximum.at(bandwidth, bundle_of.reshape(-1), cg.edge_bandwidth[between])
+    index_dtype = _index_dtype(k)
+    return {
+        'format': 'columnar',
+        'lod': 'cluster',
+        'num_nodes': int(k),
+        'num_edges': int(len(bundles)),
+        'total_nodes': int(cg.num_nodes),
+        'total_edges': int(cg.num_edges),
+        'node_ids': _pack(np.arange(k), "<i4"),
+        'x': _pack(cx, "<f4"),
+        'y': _pack(cy, "<f4"),
+        'size': _pack(size, "<u4"),
+        'edge_src': _pack(bundles // k, index_dtype),
+        'edge_dst': _pack(bundles % k, index_dtype),
+        'weight': _pack(weight, "<u4"),
+        'bandwidth': _pack(bandwidth, "<f4"),
+        'node_cluster': _pack(label, index_dtype),
+    }
+
+
+def view_payload(graph, layout, path=None, bbox=None, hops=1, max_edges=4000):
+    """
+    Görünüm sorgusu: çözülen yolun (id listesi) hops komşuluğundaki ve/veya
+    bbox = (x0, y0, x1, y1) yerleşim bölgesindeki düğümler ile aralarındaki
+    kenarlar. Kenarlar max_edges'i aşarsa bant genişliğine göre seyreltilir;
+    yolun kenarları her zaman gönderilir.
+    """
+    cg = graph.compile()
+    selected = np.zeros(cg.num_nodes, dtype=bool)
+    path_edges = None
+    if bbox is not None:
+        x0, y0, x1, y1 = bbox
+        selected |= ((layout[:, 0] >= min(x0, x1)) & (layout[:, 0] <= max(x0, x1))
+                     & (layout[:, 1] >= min(y0, y1)) & (layout[:, 1] <= max(y0, y1)))
+    if path:
+        index = cg.to_index(path)
+        index = index[index >= 0]
+        around = np.zeros(cg.num_nodes, dtype=bool)
+        around[index] = True
+        for _ in range(hops):
+            touching = around[cg.edge_src] | around[cg.edge_dst]
+            around[cg.edge_src[touching]] = True
+            around[cg.edge_dst[touching]] = True
+        selected |= around
+        path_edges = cg.edge_ids(index[:-1], index[1:])
+
+    edges = np.flatnonzero(selected[cg.edge_src] & selected[cg.edge_dst])
+    if len(edges) > max_edges:
+        order = edges[np.argsort(-cg.edge_bandwidth[edges], kind="stable")]
+        keep = order[:max_edges]
+        if path_edges is not None:
+            keep = np.concatenate([keep, path_edges[path_edges >= 0]])
+        edges = np.unique(keep)
+    return columnar_payload(graph, layout, nodes=np.flatnonzero(selected), edges=edges, lod="view")
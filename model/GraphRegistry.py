@@ -0,0 +1,94 @@
+import threading
+from collections import OrderedDict
+
+
+class GraphRegistry:
+    """
+    Sürümlü, değişmez graf kayıtları.
+
+    register() grafı dondurur (add_node/add_link artık hata verir) ve bir
+    kimlik ("g<sürüm>") döner. Çözümler get() ile aldıkları grafa sabitlenir;
+    arada yeni topoloji yüklense de aynı nesneyle biterler. Aynı anda en
+    fazla max_graphs graf tutulur, en eski kullanılan (geçerli olan hariç)
+    atılır. Atılan grafın sürümüne bağlı önbellekler on_evict ile
+    kaydedilen fonksiyonlarla temizlenir (örn. WarmStartStore.evict_version).
+    Grafın kendi önbellekleri (CSR kopyası, en kısa yollar) grafla birlikte gider.
+    """
+
+    def __init__(self, max_graphs=4):
+        self.max_graphs = max_graphs
+        self._graphs = OrderedDict()  # kimlik -> (graf, ad)
+        self._current = None
+        self._listeners = []
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def graph_id(graph):
+        return f"g{graph.version}"
+
+    def on_evict(self, callback):
+        """callback(version): graf atılınca çağrılır."""
+        self._listeners.append(callback)
+
+    def register(self, graph, name=None, make_current=True):
+        graph.freeze()
+        graph_id = self.graph_id(graph)
+        with self._lock:
+            self._graphs[graph_id] = (graph, name)
+            self._graphs.move_to_end(graph_id)
+            if make_current or self._current is None:
+                self._current = graph_id
+            evicted = []
+            for old_id in list(self._graphs):
+                if len(self._graphs) <= self.max_graphs: break
+                if old_id != self._current:
+                    evicted.append(self._graphs.pop(old_id)[0])
+        for old in evicted:
+            self._notify(old)
+        return graph_id
+
+    def get(self, graph_id=None):
+        """Kimliği verilen (yoksa geçerli) graf; bulunamazsa None."""
+        with self._lock:
+            graph_id = graph_id or self._current
+            entry = self._graphs.get(graph_id)
+            if entry is None: return None
+            self._graphs.move_to_end(graph_id)
+            return entry[0]
+
+    def current_id(self):
+        with self._lock:
+            return self._current
+
+    def set_current(self, graph_id):
+        with self._lock:
+            if graph_id not in self._graphs:
+                raise KeyError(graph_id)
+            self._current = graph_id
+
+    def evict(self, graph_id):
+        with self._lock:
+            entry = self._graphs.pop(graph_id, None)
+            if entry is None: return False
+            if self._current == graph_id:
+                self._current = next(reversed(self._graphs), None)
+        self._notify(entry[0])
+        return True
+
+    def _notify(self, graph):
+        for callback in self._listeners:
+            callback(graph.version)
+
+    def list(self):
+        with self._lock:
+            return [{
+                'id': graph_id,
+                'name': name,
+                'version': graph.version,
+                'nodes': graph.node_count(),
+                'links': graph.link_count(),
+                'current': graph_id == self._current,
+            } for graph_id, (graph, name) in self._graphs.items()]
+
+    def __len__(self):
+        return len(self._graphs)
@@ -0,0 +1,144 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import uuid
+import numpy as np
+from model.CompiledGraph import CompiledGraph
+
+# Biçim değişirse artırılır; eski anlık görüntüler yeniden üretilir
+FORMAT_VERSION = 1
+MANIFEST = "manifest.json"
+# Kök dizinde tutulan en fazla anlık görüntü sayısı (eskiler silinir)
+KEEP_SNAPSHOTS = 3
+
+
+def source_hash(paths):
+    """Kaynak dosyaların içerik özeti (sha256). Olmayan dosyalar atlanır."""
+    h = hashlib.sha256()
+    for path in paths:
+        if not os.path.exists(path): continue
+        h.update(os.path.basename(path).encode("utf-8"))
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+    return h.hexdigest()
+
+
+def read_manifest(directory):
+    path = os.path.join(directory, MANIFEST)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def is_fresh(directory, expected_hash):
+    """Anlık görüntü bu biçim sürümünde ve aynı kaynaktan üretildiyse True."""
+    manifest = read_manifest(directory)
+    return (manifest is not None
+            and manifest.get("format_version") == FORMAT_VERSION
+            and manifest.get("source_hash") == expected_hash)
+
+
+def snapshot_dir(root, source_hash):
+    """Kök altında bu biçim sürümü ve kaynak özetine ait alt dizin."""
+    return os.path.join(root, f"v{FORMAT_VERSION}_{source_hash[:16]}")
+
+
+def locate(root, source_hash):
+    """Kaynak özetine uyan güncel anlık görüntünün dizini, yoksa None."""
+    directory = snapshot_dir(root, source_hash)
+    return directory if is_fresh(directory, source_hash) else None
+
+
+def save(graph, root, source_hash=None):
+    """
+    Grafı ham .npy dosyaları + manifest olarak kök altında yeni bir dizine
+    yazar ve o dizini döner: düğüm öznitelikleri, CSR komşuluk, link
+    öznitelikleri ve talepler.
+
+    Var olan dosyalar asla yeniden yazılmaz: başka graflar/süreçler onları
+    mmap ile açık tutuyor olabilir ve eşlenmiş dosyanın kısaltılması okuyanı
+    SIGBUS ile düşürür. Dosyalar önce geçici dizine yazılır, sonra dizin
+    tek adımda yerine taşınır. Aynı kaynaktan güncel bir anlık görüntü
+    zaten varsa o kullanılır.
+    """
+    source_hash = source_hash or uuid.uuid4().hex
+    existing = locate(root, source_hash)
+    if existing:
+        return existing
+    os.makedirs(root, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=".tmp_", dir=root)
+    try:
+        _write(graph, staging, source_hash)
+        target = snapshot_dir(root, source_hash)
+        if os.path.exists(target):
+            # Bozuk eski dizin kenara taşınır (yeniden adlandırma eşlemeleri bozmaz)
+            os.rename(target, os.path.join(root, f".stale_{uuid.uuid4().hex[:8]}"))
+        os.rename(staging, target)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    _prune(root, keep=target)
+    return target
+
+
+def _prune(root, keep):
+    """
+    En yeni KEEP_SNAPSHOTS dizin dışındakileri siler. Eşlenmiş dosyanın
+    silinmesi (kısaltılmasının aksine) açık eşlemeleri bozmaz; silinemezse
+    (örn. Windows'ta açık dosya) bırakılır.
+    """
+    names = os.listdir(root)
+    for name in names:
+        if name.startswith(".stale_"):
+            shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+    entries = [os.path.join(root, name) for name in names
+               if name.startswith("v") and os.path.isdir(os.path.join(root, name))]
+    entries.sort(key=os.path.getmtime, reverse=True)
+    for old in entries[KEEP_SNAPSHOTS:]:
+        if old != keep:
+            shutil.rmtree(old, ignore_errors=True)
+
+
+def _write(graph, directory, source_hash):
+    cg = graph.compile()
+    arrays = cg.state()
+
+    for name, arr in arrays.items():
+        np.save(os.path.join(directory, name + ".npy"), np.ascontiguousarray(arr))
+
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "source_hash": source_hash,
+        "num_nodes": int(cg.num_nodes),
+        "num_edges": int(cg.num_edges),
+        "arrays": sorted(arrays),
+        "demands": graph.demands,
+    }
+    with open(os.path.join(directory, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+
+
+def load(directory, mmap=True):
+    """
+    Anlık görüntüyü yükler. mmap=True ise diziler np.memmap olarak
+    (kopyasız, salt okunur) açılır ve süreçler sayfa önbelleğini paylaşır.
+    """
+    from model.NetworkGraph import NetworkGraph
+
+    manifest = read_manifest(directory)
+    if manifest is None or manifest.get("format_version") != FORMAT_VERSION:
+        raise ValueError(f"Geçerli bir graf anlık görüntüsü değil: {directory}")
+
+    mode = "r" if mmap else None
+    arrays = {name: np.load(os.path.join(directory, name + ".npy"), mmap_mode=mode)
+              for name in manifest["arrays"]}
+    cg = CompiledGraph.from_state(arrays)
+
+    graph = NetworkGraph.from_compiled(cg)
+    graph.add_demands(manifest.get("demands", {}))
+    graph.snapshot_path = directory
+    return graph
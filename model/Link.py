@@ -1,4 +1,6 @@
 class Link:
+    __slots__ = ('source', 'target', 'delay', 'bandwidth', 'reliability')
+
     def __init__(self, source, target, delay, bandwidth, reliability):
         self.source = source  # Node nesnesi
         self.target = target  # Node nesnesi
@@ -7,4 +9,30 @@ class Link:
         self.reliability = float(reliability)
 
     def __repr__(self):
-        return f"Link({self.source.id} -> {self.target.id}, bw={self.bandwidth})"
\ No newline at end of file
+        return f"Link({self.source.id} -> {self.target.id}, bw={self.bandwidth})"
+
+
+class LinkView:
+    """
+    Derlenmiş grafın kenar dizilerine bakan hafif Link görünümü.
+    Öznitelikler kopyalanmaz, her okuma ortak diziden yapılır.
+    """
+    __slots__ = ('source', 'target', '_graph', '_e')
+
+    def __init__(self, source, target, compiled, edge_id):
+        self.source = source  # Node görünümü
+        self.target = target  # Node görünümü
+        self._graph = compiled
+        self._e = edge_id
+
+    @property
+    def delay(self): return float(self._graph.edge_delay[self._e])
+
+    @property
+    def bandwidth(self): return float(self._graph.edge_bandwidth[self._e])
+
+    @property
+    def reliability(self): return float(self._graph.edge_reliability[self._e])
+
+    def __repr__(self):
+        return f"Link({self.source.id} -> {self.target.id}, bw={self.bandwidth})"
@@ -1,38 +1,209 @@
+import itertools
 import networkx as nx
+import numpy as np
+from model.CompiledGraph import CompiledGraph
+from model import GraphSnapshot
+from model.Node import NodeView
+from model.Link import LinkView
+
+# Tüm graflar için tekil sürüm numaraları (önbellek anahtarı olarak kullanılır)
+_versions = itertools.count(1)
 
 class NetworkGraph:
     def __init__(self):
-        self.nodes = {}  # id -> Node nesnesi
-        self.links = []  # Link nesneleri listesi
+        self._nodes = {}  # id -> Node nesnesi
+        self._links = []  # Link nesneleri listesi
         self.demands = {} # Key: "SourceID-TargetID", Value: Bandwidth
-        
-        # Hesaplamalar ve çizim için yardımcı NetworkX yapısı
-        self.nx_graph = nx.Graph() 
+
+        # Çizim için yardımcı NetworkX yapısı (ilk erişimde Node/Link nesnelerinden kurulur)
+        self._nx_graph = None
+
+        # Yönsüz kenar dizini: (küçük id, büyük id) -> Link (add_link sırasında güncellenir)
+        self._edge_index = {}
+
+        # Toplu yüklemede graf yalnızca dizilerden oluşur; Node/Link ve NetworkX
+        # görünümleri biri onlara eriştiğinde bu dizilere bakan görünümler olarak üretilir
+        self._backing = None
+        self._coords = None
+
+        # Algoritmaların kullandığı dizi tabanlı kopya (ilk ihtiyaçta üretilir)
+        self._compiled = None
+        self.version = next(_versions)
+        # GraphRegistry'ye kaydedilen graf dondurulur; sürümü artık değişmez
+        self.frozen = False
+        # Anlık görüntüden yüklendiyse dizin yolu (işçi süreçler aynı dosyaları eşler)
+        self.snapshot_path = None
+
+    @classmethod
+    def from_columns(cls, node_ids, node_s_ms, node_reliability,
+                     edge_src, edge_dst, edge_delay, edge_bandwidth, edge_reliability,
+                     node_x=None, node_y=None):
+        """
+        Sütun dizilerinden graf kurar. Node/Link nesneleri ve NetworkX grafiği
+        ilk erişimde üretilir; algoritmalar doğrudan dizilerle çalışır.
+        """
+        compiled = CompiledGraph(node_ids, node_s_ms, node_reliability,
+                                 edge_src, edge_dst, edge_delay, edge_bandwidth, edge_reliability,
+                                 node_x, node_y)
+        return cls.from_compiled(compiled)
+
+    @classmethod
+    def from_compiled(cls, compiled):
+        """Derlenmiş graf etrafında (kopyasız) tembel graf kurar."""
+        graph = cls()
+        graph._compiled = compiled
+        graph._backing = compiled
+        # Koordinatlar derlenmiş grafın sütunlarıdır (id'ye göre sıralı)
+        graph._coords = (compiled.node_x, compiled.node_y)
+        graph._nodes = None
+        graph._links = None
+        graph._nx_graph = None
+        graph._edge_index = None
+        return graph
+
+    # --- Tembel görünümler ---
+    @property
+    def nodes(self):
+        if self._nodes is None:
+            cg = self._backing
+            self._nodes = {n_id: NodeView(cg, i, self._coords)
+                           for i, n_id in enumerate(cg.node_ids.tolist())}
+        return self._nodes
+
+    @property
+    def links(self):
+        if self._links is None:
+            cg = self._backing
+            nodes = self.nodes
+            ids = cg.node_ids.tolist()
+            self._links = [LinkView(nodes[ids[u]], nodes[ids[v]], cg, e)
+                           for e, (u, v) in enumerate(zip(cg.edge_src.tolist(), cg.edge_dst.tolist()))]
+        return self._links
+
+    @property
+    def nx_graph(self):
+        if self._nx_graph is None:
+            # Öznitelikler kopyalanmaz; NetworkX yalnızca nesneye referans tutar
+            G = nx.Graph()
+            G.add_nodes_from((node.id, {'object': node}) for node in self.nodes.values())
+            G.add_edges_from((link.source.id, link.target.id, {'object': link}) for link in self.links)
+            self._nx_graph = G
+        return self._nx_graph
+
+    @property
+    def edge_index(self):
+        if self._edge_index is None:
+            self._edge_index = {}
+            for link in self.links:
+                self._edge_index[self.edge_key(link.source.id, link.target.id)] = link
+        return self._edge_index
+
+    @staticmethod
+    def edge_key(a, b):
+        a, b = int(a), int(b)
+        return (a, b) if a <= b else (b, a)
+
+    def node_count(self):
+        if self._nodes is None: return self._backing.num_nodes
+        return len(self._nodes)
+
+    def link_count(self):
+        if self._links is None: return self._backing.num_edges
+        return len(self._links)
 
     def add_node(self, node):
+        self._invalidate()
         self.nodes[node.id] = node
-        self.nx_graph.add_node(node.id, reliability=node.reliability, s_ms=node.s_ms ,pos=(node.x, node.y))
+        # Öznitelikler Node üzerinde tek kopya; NetworkX (kurulmuşsa) yalnızca referans tutar
+        if self._nx_graph is not None:
+            self._nx_graph.add_node(node.id, object=node)
 
     def add_link(self, link):
+        self._invalidate()
         self.links.append(link)
-        # NetworkX grafiğine de ekle (Algoritmalar için)
-        self.nx_graph.add_edge(
-            link.source.id, 
-            link.target.id, 
-            delay=link.delay, 
-            bandwidth=link.bandwidth, 
-            reliability=link.reliability,
-            object=link # Link nesnesine graph üzerinden erişmek için
-        )
+        # Aynı düğüm çifti tekrar eklenirse son link geçerlidir (NetworkX ile aynı)
+        self.edge_index[self.edge_key(link.source.id, link.target.id)] = link
+        # NetworkX grafiğine de ekle (Link nesnesine graph üzerinden erişmek için)
+        if self._nx_graph is not None:
+            self._nx_graph.add_edge(link.source.id, link.target.id, object=link)
+
+    def freeze(self):
+        """Grafı salt okunur yapar (paylaşılan sürüm üzerinde çalışan çözümler için)."""
+        self.frozen = True
+
+    def _invalidate(self):
+        if self.frozen:
+            raise RuntimeError("Dondurulmuş graf değiştirilemez; yeni bir graf oluşturup kaydedin.")
+        # Yapı değişti: dizi kopyası ve ona bağlı önbellekler geçersiz.
+        # Tembel graf önce nesne görünümlerini üretir (görünümler eski dizilere bakmaya devam eder).
+        if self._backing is not None:
+            self.links
+            self._backing = None
+        self._compiled = None
+        self.snapshot_path = None
+        self.version = next(_versions)
+
+    def compile(self, min_bandwidth=0):
+        """
+        Grafı CSR dizilerine dondurur. Sonuç önbelleğe alınır,
+        düğüm/link eklenince geçersiz olur.
+        min_bandwidth verilirse yalnızca bu kapasiteyi taşıyan kenarların görünümü döner.
+        """
+        if self._compiled is None:
+            self._compiled = CompiledGraph.from_network_graph(self)
+        return self._compiled.compile(min_bandwidth)
+
+    def save_snapshot(self, root, source_hash=None):
+        """
+        Grafı sürümlü ikili anlık görüntü olarak (ham .npy + manifest) kök
+        altında yeni bir dizine yazar ve o dizini döner.
+        """
+        return GraphSnapshot.save(self, root, source_hash)
+
+    @staticmethod
+    def load_snapshot(directory, mmap=True):
+        """Anlık görüntüden grafı yükler; mmap=True ise diziler kopyalanmadan eşlenir."""
+        return GraphSnapshot.load(directory, mmap)
 
     def add_demands(self, demands_map):
+        if self.frozen:
+            raise RuntimeError("Dondurulmuş graf değiştirilemez; yeni bir graf oluşturup kaydedin.")
         self.demands = demands_map
 
     def get_node(self, node_id):
         return self.nodes.get(int(node_id))
-    
+
     def get_links(self):
         return self.links
 
+    def get_link(self, a_id, b_id):
+        """a ile b arasındaki link (yön fark etmez), yoksa None. O(1)."""
+        if self._edge_index is None and self._backing is not None:
+            # Tembel graf: tüm link görünümlerini üretmeden CSR üzerinden bulunur
+            cg = self._backing
+            e = int(cg.edge_ids([cg.index_of(a_id)], [cg.index_of(b_id)])[0])
+            if e < 0: return None
+            src, dst = int(cg.node_ids[cg.edge_src[e]]), int(cg.node_ids[cg.edge_dst[e]])
+            return LinkView(self.nodes[src], self.nodes[dst], cg, e)
+        return self.edge_index.get(self.edge_key(a_id, b_id))
+
+    def path_attributes(self, path_ids):
+        """
+        Yoldaki her adımın link öznitelikleri tek seferde:
+        {'delay', 'bandwidth', 'reliability'} -> adım sayısı uzunluğunda diziler.
+        Link bulunmayan adımlar NaN olur.
+        """
+        cg = self.compile()
+        idx = cg.to_index(path_ids)
+        eids = cg.edge_ids(idx[:-1], idx[1:])
+        missing = eids < 0
+        attrs = {}
+        for name, column in (('delay', cg.edge_delay), ('bandwidth', cg.edge_bandwidth),
+                             ('reliability', cg.edge_reliability)):
+            values = np.asarray(column, dtype=np.float64)[np.where(missing, 0, eids)]
+            values[missing] = np.nan
+            attrs[name] = values
+        return attrs
+
     def get_demands(self):
-        return self.demands
\ No newline at end of file
+        return self.demands
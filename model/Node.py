@@ -1,4 +1,6 @@
 class Node:
+    __slots__ = ('id', 'reliability', 's_ms', 'x', 'y')
+
     def __init__(self, id, reliability=1.0, s_ms=0.0, x=0.0, y=0.0):
         self.id = int(id)
         self.reliability = float(reliability)
@@ -13,4 +15,41 @@ class Node:
         return hash(self.id)
 
     def __eq__(self, other):
-        return isinstance(other, Node) and self.id == other.id
+        return isinstance(other, (Node, NodeView)) and self.id == other.id
+
+
+class NodeView:
+    """
+    Derlenmiş grafın düğüm dizilerine bakan hafif Node görünümü.
+    Öznitelikler kopyalanmaz, her okuma ortak diziden yapılır.
+    """
+    __slots__ = ('_graph', '_i', '_coords')
+
+    def __init__(self, compiled, index, coords):
+        self._graph = compiled
+        self._i = index
+        self._coords = coords  # (x dizisi, y dizisi), derlenmiş sırayla
+
+    @property
+    def id(self): return int(self._graph.node_ids[self._i])
+
+    @property
+    def reliability(self): return float(self._graph.node_reliability[self._i])
+
+    @property
+    def s_ms(self): return float(self._graph.node_s_ms[self._i])
+
+    @property
+    def x(self): return float(self._coords[0][self._i])
+
+    @property
+    def y(self): return float(self._coords[1][self._i])
+
+    def __repr__(self):
+        return f"Node(id={self.id}, r={self.reliability}, s_ms={self.s_ms})"
+
+    def __hash__(self):
+        return hash(self.id)
+
+    def __eq__(self, other):
+        return isinstance(other, (Node, NodeView)) and self.id == other.id
@@ -0,0 +1,116 @@
+import heapq
+import threading
+from array import array
+from collections import OrderedDict
+import numpy as np
+
+
+class ShortestPathCache:
+    """
+    Değişmeyen bir CompiledGraph için en kısa yol kahini.
+
+    Bir kaynak düğüm için Dijkstra bir kez çalıştırılır ve öncül
+    (predecessor) satırı saklanır; sonraki sorgularda yol O(adım) sürede
+    geri kurulur. Bağlantı kontrolleri has_path yerine önceden hesaplanmış
+    bileşen etiketleriyle yapılır.
+
+    Bellek sınırı: ağırlık başına son kullanılan en fazla MAX_ROWS satır
+    (LRU) tutulur, her satır N adet 4 baytlık tamsayıdır; yani önbellek
+    en fazla 2 x MAX_ROWS x N x 4 bayt yer kaplar. Atılan kaynak yeniden
+    sorulursa Dijkstra tekrar çalışır.
+    """
+
+    WEIGHTS = ("delay", "bandwidth")
+    MAX_ROWS = 256
+
+    def __init__(self, compiled):
+        self.graph = compiled
+        # weight -> {kaynak: öncül satırı (array('i'))}, LRU sırasında
+        self._rows = {w: OrderedDict() for w in self.WEIGHTS}
+        self._lock = threading.Lock()
+        # Önbellek ıskasıyla çalışan Dijkstra sayısı (SolverProfile için)
+        self.dijkstra_runs = 0
+        self.components = self._label_components()
+
+    def _label_components(self):
+        n = self.graph.num_nodes
+        labels = [-1] * n
+        adj = self.graph._python_adjacency("delay")
+        label = 0
+        for start in range(n):
+            if labels[start] >= 0: continue
+            labels[start] = label
+            stack = [start]
+            while stack:
+                u = stack.pop()
+                for v, _ in adj[u]:
+                    if labels[v] < 0:
+                        labels[v] = label
+                        stack.append(v)
+            label += 1
+        return np.asarray(labels, dtype=np.int64)
+
+    def connected(self, u, v):
+        return self.components[u] == self.components[v]
+
+    def _row(self, src, weight):
+        rows = self._rows[weight]
+        with self._lock:
+            row = rows.get(src)
+            if row is not None:
+                rows.move_to_end(src)
+                return row
+            self.dijkstra_runs += 1
+        # Dijkstra kilit dışında; iki iş parçacığı aynı satırı hesaplarsa sonuç aynıdır
+        row = array("i", self._dijkstra(src, weight))
+        with self._lock:
+            rows[src] = row
+            rows.move_to_end(src)
+            while len(rows) > self.MAX_ROWS:
+                rows.popitem(last=False)
+        return row
+
+    def _dijkstra(self, src, weight):
+        adj = self.graph._python_adjacency(weight)
+        n = self.graph.num_nodes
+        pred = [-1] * n
+        done = [False] * n
+        best = [float("inf")] * n
+        best[src] = 0.0
+        heap = [(0.0, src)]
+        while heap:
+            d, u = heapq.heappop(heap)
+            if done[u]: continue
+            done[u] = True
+            for v, w in adj[u]:
+                if done[v]: continue
+                nd = d + w
+                if nd < best[v]:
+                    best[v] = nd
+                    pred[v] = u
+                    heapq.heappush(heap, (nd, v))
+        return pred
+
+    def path(self, src, dst, weight="delay"):
+        """
+        src -> dst en kısa yolu (indeks listesi), yol yoksa None.
+        Yol her zaman src köklü satırdan kurulur: eşit maliyetli yollardan
+        hangisinin döneceği önbellekte hangi satırların bulunduğuna
+        (yani önceki sorgulara ve işçi dağılımına) bağlı olmaz.
+        """
+        if src == dst:
+            return [src]
+        if not self.connected(src, dst):
+            return None
+
+        pred = self._row(src, weight)
+        path = [dst]
+        while path[-1] != src:
+            path.append(pred[path[-1]])
+        path.reverse()
+        return path
+
+    def predecessor_matrix(self, weight="delay"):
+        """Tüm kaynaklar için öncül matrisi (N x N, yol yoksa -1)."""
+        return np.asarray([self._row(s, weight) for s in range(self.graph.num_nodes)],
+                          dtype=np.int64).reshape(self.graph.num_nodes, self.graph.num_nodes)